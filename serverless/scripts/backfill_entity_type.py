@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Stratigos AI Platform - Backfill Portfolio Entity Type
+
+Sets entity_type on portfolios written before the ByEntityType index
+existed. GET /portfolios lists portfolios from that index, so portfolios
+without the attribute do not appear in listings. Run it once per
+environment after deploying the index. Running it again is safe.
+
+Usage:
+    python scripts/backfill_entity_type.py [environment] [region]
+"""
+
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+# Must match ENTITY_TYPE in src/lib/models/portfolio.py
+ENTITY_TYPE = "portfolio"
+
+
+def backfill_entity_type(table) -> int:
+    """
+    Set entity_type on every portfolio that does not have it.
+
+    Args:
+        table: DynamoDB Table resource for portfolios
+
+    Returns:
+        int: Number of portfolios updated
+    """
+    updated = 0
+    scan_kwargs = {
+        "FilterExpression": Attr("entity_type").not_exists(),
+        "ProjectionExpression": "id",
+    }
+
+    while True:
+        page = table.scan(**scan_kwargs)
+
+        for item in page["Items"]:
+            # Only touch items that still exist, so a concurrent delete is not undone
+            try:
+                table.update_item(
+                    Key={"id": item["id"]},
+                    UpdateExpression="SET entity_type = :entity_type",
+                    ConditionExpression=Attr("id").exists(),
+                    ExpressionAttributeValues={":entity_type": ENTITY_TYPE},
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+        if "LastEvaluatedKey" not in page:
+            return updated
+        scan_kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def main() -> None:
+    """Backfill the portfolio table of the given environment."""
+    environment = sys.argv[1] if len(sys.argv) > 1 else "dev"
+    region = sys.argv[2] if len(sys.argv) > 2 else "us-east-1"
+    table_name = f"{environment}-portfolios"
+
+    print(f"🔧 Backfilling entity_type in {table_name} ({region})...")
+    table = boto3.resource("dynamodb", region_name=region).Table(table_name)
+    updated = backfill_entity_type(table)
+    print(f"✅ Updated {updated} portfolio(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -97,6 +97,32 @@ create_layers_bucket() {
     fi
 }
 
+# Function to remove unused files from the core layer
+slim_core_layer() {
+    local python_dir="$1"
+    
+    echo -e "${BLUE}Removing unused SDK models and modules...${NC}"
+    
+    # Keep only the service models the functions use (plus shared top-level files)
+    find "$python_dir/botocore/data" -mindepth 1 -maxdepth 1 -type d \
+        ! -name dynamodb ! -name s3 ! -name sts \
+        -exec rm -rf {} +
+    find "$python_dir/boto3/data" -mindepth 1 -maxdepth 1 -type d \
+        ! -name dynamodb ! -name s3 \
+        -exec rm -rf {} +
+    
+    # Type stubs
+    find "$python_dir" -name "*.pyi" -delete
+    
+    # Make sure the slimmed layer still imports and builds its clients
+    PYTHONPATH="$python_dir" python3.11 -c "
+import boto3, orjson, requests
+boto3.client('dynamodb', region_name='us-east-1')
+boto3.client('s3', region_name='us-east-1')
+boto3.resource('dynamodb', region_name='us-east-1')
+"
+}
+
 # Function to create core dependencies layer
 create_core_layer() {
     echo -e "${YELLOW}📦 Creating Core Dependencies Layer...${NC}"
@@ -111,12 +137,19 @@ create_core_layer() {
     echo -e "${BLUE}Installing core dependencies...${NC}"
     pip3.11 install \
         boto3 \
-        pydantic \
+        orjson \
         requests \
         python-dateutil \
         -t "$python_dir" \
         --upgrade
     
+    # Drop SDK models and modules the functions never load
+    slim_core_layer "$python_dir"
+    
+    # Precompile bytecode so imports never fall back to the read-only source
+    echo -e "${BLUE}Compiling bytecode...${NC}"
+    python3.11 -m compileall -q --invalidation-mode unchecked-hash "$python_dir"
+    
     # Create zip file
     echo -e "${BLUE}Creating zip file...${NC}"
     cd "$layer_dir"
@@ -148,11 +181,13 @@ create_numeric_layer() {
     echo -e "${BLUE}Installing numeric dependencies...${NC}"
     pip3.11 install \
         numpy \
-        pandas \
-        scipy \
         -t "$python_dir" \
         --upgrade
     
+    # Precompile bytecode so imports never fall back to the read-only source
+    echo -e "${BLUE}Compiling bytecode...${NC}"
+    python3.11 -m compileall -q --invalidation-mode unchecked-hash "$python_dir"
+    
     # Create zip file
     echo -e "${BLUE}Creating zip file...${NC}"
     cd "$layer_dir"
@@ -187,6 +222,10 @@ create_visualization_layer() {
         -t "$python_dir" \
         --upgrade
     
+    # Precompile bytecode so imports never fall back to the read-only source
+    echo -e "${BLUE}Compiling bytecode...${NC}"
+    python3.11 -m compileall -q --invalidation-mode unchecked-hash "$python_dir"
+    
     # Create zip file
     echo -e "${BLUE}Creating zip file...${NC}"
     cd "$layer_dir"
@@ -241,14 +280,12 @@ display_layer_info() {
     echo ""
     echo -e "${YELLOW}Core Dependencies Layer:${NC}"
     echo "  - boto3==1.28.0"
-    echo "  - pydantic==2.4.2"
+    echo "  - orjson==3.9.10"
     echo "  - requests==2.31.0"
     echo "  - python-dateutil==2.9.0.post0"
     echo ""
     echo -e "${YELLOW}Numeric Computing Layer:${NC}"
     echo "  - numpy==1.24.3"
-    echo "  - pandas==2.0.3"
-    echo "  - scipy==1.11.1"
     echo ""
     echo -e "${YELLOW}Visualization Layer:${NC}"
     echo "  - matplotlib==3.7.2"
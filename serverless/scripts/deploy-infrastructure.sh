@@ -140,6 +140,10 @@ build_application() {
         echo -e "${RED}❌ SAM build failed${NC}"
         exit 1
     fi
+    
+    # Precompile bytecode for the Lambda runtime so cold starts never compile our modules
+    echo -e "${BLUE}Compiling bytecode...${NC}"
+    python3.11 -m compileall -q --invalidation-mode unchecked-hash .aws-sam/build
 }
 
 # Function to deploy infrastructure
@@ -77,6 +77,14 @@ build_project() {
     echo "🔨 Building the project with SAM..."
     sam build
     
+    # Precompile bytecode for the Lambda runtime so cold starts never compile our modules
+    if command -v python3.11 &> /dev/null; then
+        echo "⚙️  Compiling bytecode..."
+        python3.11 -m compileall -q --invalidation-mode unchecked-hash .aws-sam/build
+    else
+        echo "⚠️  python3.11 not found, skipping bytecode compilation"
+    fi
+    
     echo "✅ Project built"
 }
 
@@ -49,7 +49,7 @@ run_unit_tests() {
     print_section "Running unit tests"
     
     echo "🧪 Running unit tests with pytest..."
-    python -m pytest tests/unit -v
+    python -m pytest tests/unit -v -n auto
     
     echo "✅ Unit tests completed"
 }
@@ -59,7 +59,7 @@ run_integration_tests() {
     print_section "Running integration tests"
     
     echo "🧪 Running integration tests with pytest..."
-    python -m pytest tests/integration -v
+    python -m pytest tests/integration -v -n auto
     
     echo "✅ Integration tests completed"
 }
@@ -69,7 +69,7 @@ run_all_tests() {
     print_section "Running all tests"
     
     echo "🧪 Running all tests with pytest..."
-    python -m pytest tests -v
+    python -m pytest tests -v -n auto
     
     echo "✅ All tests completed"
 }
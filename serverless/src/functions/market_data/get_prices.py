@@ -4,21 +4,17 @@ Get Market Prices Lambda Function
 This function handles GET requests to the /market-data/prices endpoint.
 """
 
-import json
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
-import requests
-import yfinance as yf
-
+from src.lib.services import yahoo_finance
 from src.lib.utils import response
+from src.lib.utils.dates import parse_date
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get S3 bucket name from environment variables
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "")
@@ -35,8 +31,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Getting market prices")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Getting market prices")
+    logger.debug("Event: %s", event)
 
     try:
         # Get query parameters
@@ -67,6 +63,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "Invalid parameters", validation_errors
             )
         
+        # Pass canonical dates on, so equal dates share cache entries
+        start_date = parse_date(start_date).isoformat()
+        end_date = parse_date(end_date).isoformat()
+
         # Get market prices
         prices = get_market_prices(symbols, start_date, end_date, interval)
         
@@ -96,55 +96,7 @@ def get_market_prices(
         Dict: Market prices
     """
     # Download data from Yahoo Finance
-    data = yf.download(
-        tickers=symbols,
-        start=start_date,
-        end=end_date,
-        interval=interval,
-        group_by="ticker",
-        auto_adjust=True,
-        prepost=False,
-        threads=True,
-    )
-    
-    # Process data
-    result = {}
-    
-    # Handle single symbol case
-    if len(symbols) == 1:
-        symbol = symbols[0]
-        symbol_data = data
-        
-        # Convert to dictionary
-        prices = {
-            "dates": symbol_data.index.strftime("%Y-%m-%d").tolist(),
-            "open": symbol_data["Open"].tolist(),
-            "high": symbol_data["High"].tolist(),
-            "low": symbol_data["Low"].tolist(),
-            "close": symbol_data["Close"].tolist(),
-            "volume": symbol_data["Volume"].tolist(),
-        }
-        
-        result[symbol] = prices
-    else:
-        # Handle multiple symbols
-        for symbol in symbols:
-            if symbol in data.columns.levels[0]:
-                symbol_data = data[symbol]
-                
-                # Convert to dictionary
-                prices = {
-                    "dates": symbol_data.index.strftime("%Y-%m-%d").tolist(),
-                    "open": symbol_data["Open"].tolist(),
-                    "high": symbol_data["High"].tolist(),
-                    "low": symbol_data["Low"].tolist(),
-                    "close": symbol_data["Close"].tolist(),
-                    "volume": symbol_data["Volume"].tolist(),
-                }
-                
-                result[symbol] = prices
-    
-    return result
+    return yahoo_finance.get_price_histories(symbols, start_date, end_date, interval)
 
 
 def validate_parameters(
@@ -169,17 +121,15 @@ def validate_parameters(
         errors.append("At least one symbol is required")
     
     # Validate dates
-    try:
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    except ValueError:
+    start_dt = parse_date(start_date)
+    if start_dt is None:
         errors.append("Invalid start date format (should be YYYY-MM-DD)")
     
-    try:
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-    except ValueError:
+    end_dt = parse_date(end_date)
+    if end_dt is None:
         errors.append("Invalid end date format (should be YYYY-MM-DD)")
     
-    if 'start_dt' in locals() and 'end_dt' in locals() and start_dt > end_dt:
+    if start_dt and end_dt and start_dt > end_dt:
         errors.append("Start date cannot be after end date")
     
     # Validate interval
@@ -4,21 +4,19 @@ Get Market Returns Lambda Function
 This function handles GET requests to the /market-data/returns endpoint.
 """
 
-import json
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import numpy as np
-import pandas as pd
-import yfinance as yf
 
+from src.lib.services import yahoo_finance
 from src.lib.utils import response
+from src.lib.utils.dates import parse_date
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get S3 bucket name from environment variables
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "")
@@ -35,8 +33,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Getting market returns")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Getting market returns")
+    logger.debug("Event: %s", event)
 
     try:
         # Get query parameters
@@ -67,6 +65,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "Invalid parameters", validation_errors
             )
         
+        # Pass canonical dates on, so equal dates share cache entries
+        start_date = parse_date(start_date).isoformat()
+        end_date = parse_date(end_date).isoformat()
+
         # Get market returns
         returns = get_market_returns(symbols, start_date, end_date, return_type)
         
@@ -97,77 +99,51 @@ def get_market_returns(
     """
     # Download data from Yahoo Finance
     interval = "1d"  # Always download daily data
-    
-    data = yf.download(
-        tickers=symbols,
-        start=start_date,
-        end=end_date,
-        interval=interval,
-        group_by="ticker",
-        auto_adjust=True,
-        prepost=False,
-        threads=True,
-    )
-    
-    # Process data
+    histories = yahoo_finance.get_price_histories(symbols, start_date, end_date, interval)
+
+    # Calculate returns
     result = {}
-    
-    # Handle single symbol case
-    if len(symbols) == 1:
-        symbol = symbols[0]
-        symbol_data = data
-        
-        # Calculate returns
-        returns_data = calculate_returns(symbol_data, return_type)
-        
-        result[symbol] = returns_data
-    else:
-        # Handle multiple symbols
-        for symbol in symbols:
-            if symbol in data.columns.levels[0]:
-                symbol_data = data[symbol]
-                
-                # Calculate returns
-                returns_data = calculate_returns(symbol_data, return_type)
-                
-                result[symbol] = returns_data
-    
+    for symbol, prices in histories.items():
+        result[symbol] = calculate_returns(prices["dates"], prices["close"], return_type)
+
     return result
 
 
-def calculate_returns(data: pd.DataFrame, return_type: str) -> List[float]:
+def calculate_returns(
+    dates: List[str], close_prices: List[float], return_type: str
+) -> List[float]:
     """
     Calculate returns from price data.
 
+    Weekly and monthly returns are computed from the last close in each
+    calendar week (Monday to Sunday) or month.
+
     Args:
-        data: Price data
+        dates: Price dates (YYYY-MM-DD, ascending)
+        close_prices: Close prices
         return_type: Return type (daily, weekly, monthly)
 
     Returns:
         List[float]: Returns
     """
-    # Get close prices
-    close_prices = data["Close"]
-    
-    # Calculate returns based on return type
-    if return_type == "daily":
-        returns = close_prices.pct_change().dropna().tolist()
-    elif return_type == "weekly":
-        # Resample to weekly and calculate returns
-        weekly_prices = close_prices.resample("W").last()
-        returns = weekly_prices.pct_change().dropna().tolist()
-    elif return_type == "monthly":
-        # Resample to monthly and calculate returns
-        monthly_prices = close_prices.resample("M").last()
-        returns = monthly_prices.pct_change().dropna().tolist()
-    else:
-        # Default to daily
-        returns = close_prices.pct_change().dropna().tolist()
-    
-    # Convert numpy float64 to Python float
-    returns = [float(r) for r in returns]
-    
-    return returns
+    prices = np.asarray(close_prices, dtype=np.float64)
+
+    # Keep the last close of each period
+    if return_type in ("weekly", "monthly") and len(prices):
+        days = np.asarray(dates, dtype="datetime64[D]")
+        if return_type == "weekly":
+            # Day 0 (1970-01-01) is a Thursday, so shift weeks to start on Monday
+            periods = (days.astype(np.int64) + 3) // 7
+        else:
+            periods = days.astype("datetime64[M]")
+
+        period_ends = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+        prices = prices[period_ends]
+
+    # Calculate simple returns
+    returns = prices[1:] / prices[:-1] - 1.0
+
+    return returns.tolist()
 
 
 def validate_parameters(
@@ -192,17 +168,15 @@ def validate_parameters(
         errors.append("At least one symbol is required")
     
     # Validate dates
-    try:
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    except ValueError:
+    start_dt = parse_date(start_date)
+    if start_dt is None:
         errors.append("Invalid start date format (should be YYYY-MM-DD)")
     
-    try:
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-    except ValueError:
+    end_dt = parse_date(end_date)
+    if end_dt is None:
         errors.append("Invalid end date format (should be YYYY-MM-DD)")
     
-    if 'start_dt' in locals() and 'end_dt' in locals() and start_dt > end_dt:
+    if start_dt and end_dt and start_dt > end_dt:
         errors.append("Start date cannot be after end date")
     
     # Validate return type
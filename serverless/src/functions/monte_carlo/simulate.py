@@ -4,26 +4,47 @@ Monte Carlo Simulation Lambda Function
 This function handles POST requests to the /monte-carlo/simulate endpoint.
 """
 
-import json
+import gzip
+import io
 import logging
 import os
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 import numpy as np
+import orjson
 
-from src.lib.db import dynamo_client
+from src.lib.db import dynamo_client, s3_client
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table names from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 SIMULATION_RESULT_TABLE = os.environ.get("SIMULATION_RESULT_TABLE", "")
 
+# Bind table clients at import so they are created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+simulation_result_table = dynamo_client.get_client(SIMULATION_RESULT_TABLE)
+
+# Get S3 bucket name from environment variables
+DATA_BUCKET = os.environ.get("DATA_BUCKET", "")
+
+# Percentiles reported for final values and trajectory bands
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Maximum number of periods (10 years of trading days), which keeps the stored
+# trajectory bands within DynamoDB's 400 KB item limit
+MAX_PERIODS = 2520
+
+# Maximum number of asset returns drawn at once (4 MB of float32)
+MAX_BLOCK_ELEMENTS = 1 << 20
+
+# Random number generator, created once per container and reused across invocations
+_RNG = np.random.default_rng()
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -36,14 +57,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Running Monte Carlo simulation")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Running Monte Carlo simulation")
+    logger.debug("Event: %s", event)
 
     try:
         # Parse request body
         body = event.get("body", "{}")
         if isinstance(body, str):
-            body = json.loads(body)
+            body = orjson.loads(body)
 
         # Validate request body
         validation_errors = validate_request(body)
@@ -56,7 +77,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         portfolio_id = body.get("portfolioId")
 
         # Get portfolio
-        portfolio = dynamo_client.query_by_id(PORTFOLIO_TABLE, portfolio_id)
+        portfolio = portfolio_table.get_item({"id": portfolio_id})
         if not portfolio:
             return response.not_found("Portfolio", portfolio_id)
 
@@ -64,6 +85,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         initial_investment = body.get("initialInvestment", 10000)
         num_simulations = body.get("numSimulations", 1000)
         num_periods = body.get("numPeriods", 252)  # Default to 1 year of trading days
+        seed = body.get("seed")
+        include_trajectories = body.get("includeTrajectories", True)
         returns_data = body.get("returns", {})
         
         # Check if returns are provided for all assets
@@ -75,53 +98,90 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 [f"Returns data missing for assets: {', '.join(missing_returns)}"],
             )
 
-        # Convert returns to numpy arrays
+        # Check if returns have the same length for all assets
         asset_list = list(assets.keys())
-        returns_matrix = []
-        for asset in asset_list:
-            returns_matrix.append(returns_data[asset])
-        returns_matrix = np.array(returns_matrix)
+        num_observations = len(returns_data[asset_list[0]])
+        if any(len(returns_data[asset]) != num_observations for asset in asset_list):
+            return response.validation_error(
+                "Invalid returns data",
+                ["Returns data must have the same length for all assets"],
+            )
+
+        # Convert returns to numpy arrays
+        returns_matrix = np.empty((len(asset_list), num_observations))
+        for i, asset in enumerate(asset_list):
+            returns_matrix[i] = returns_data[asset]
 
         # Calculate mean returns and covariance matrix
         mean_returns = np.mean(returns_matrix, axis=1)
-        cov_matrix = np.cov(returns_matrix)
+        cov_matrix = np.atleast_2d(np.cov(returns_matrix))
 
         # Get portfolio weights
-        weights = np.array([assets[asset] for asset in asset_list])
+        weights = np.fromiter(
+            (assets[asset] for asset in asset_list), dtype=np.float64, count=len(asset_list)
+        )
+
+        # Use a dedicated generator when a seed is given so the run is reproducible
+        rng = np.random.default_rng(seed) if seed is not None else _RNG
 
         # Run Monte Carlo simulation
         simulation_results = run_monte_carlo_simulation(
-            weights, mean_returns, cov_matrix, initial_investment, num_periods, num_simulations
+            weights,
+            mean_returns,
+            cov_matrix,
+            initial_investment,
+            num_periods,
+            num_simulations,
+            rng,
+            keep_paths=include_trajectories,
         )
 
-        # Calculate statistics
-        final_values = simulation_results[:, -1]
-        mean_final_value = np.mean(final_values)
+        # Calculate statistics (accumulating in float64)
+        final_values = (
+            simulation_results[:, -1] if include_trajectories else simulation_results
+        )
+        mean_final_value = np.mean(final_values, dtype=np.float64)
         median_final_value = np.median(final_values)
         min_final_value = np.min(final_values)
         max_final_value = np.max(final_values)
-        std_dev = np.std(final_values)
-        
-        # Calculate percentiles
-        percentiles = {
-            "5": float(np.percentile(final_values, 5)),
-            "25": float(np.percentile(final_values, 25)),
-            "50": float(np.percentile(final_values, 50)),
-            "75": float(np.percentile(final_values, 75)),
-            "95": float(np.percentile(final_values, 95)),
-        }
+        std_dev = np.std(final_values, dtype=np.float64)
+
+        # Calculate per-period percentile bands across simulations
+        trajectory_bands = None
+        if include_trajectories:
+            bands = np.percentile(simulation_results, PERCENTILES, axis=0)
+            trajectory_bands = {
+                str(p): band.tolist() for p, band in zip(PERCENTILES, bands)
+            }
+
+            # Percentiles of the final value are the last column of the bands
+            final_percentiles = bands[:, -1]
+        else:
+            final_percentiles = np.percentile(final_values, PERCENTILES)
+
+        percentiles = dict(zip(map(str, PERCENTILES), final_percentiles.tolist()))
+
+        simulation_id = str(uuid.uuid4())
+
+        # Offload full trajectories to S3
+        trajectory_key = None
+        if include_trajectories and DATA_BUCKET:
+            trajectory_key = save_trajectories(simulation_id, simulation_results)
 
         # Create simulation result
         simulation_result = {
-            "id": str(uuid.uuid4()),
+            "id": simulation_id,
             "portfolioId": portfolio_id,
             "parameters": {
                 "initialInvestment": initial_investment,
                 "numSimulations": num_simulations,
                 "numPeriods": num_periods,
+                "seed": seed,
+                "includeTrajectories": include_trajectories,
             },
             "result": {
-                "trajectories": simulation_results.tolist(),
+                "trajectoryBands": trajectory_bands,
+                "trajectoryS3Key": trajectory_key,
                 "statistics": {
                     "meanFinalValue": float(mean_final_value),
                     "medianFinalValue": float(median_final_value),
@@ -131,11 +191,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "percentiles": percentiles,
                 },
             },
-            "createdAt": datetime.utcnow().isoformat(),
+            "createdAt": datetime.now(timezone.utc).isoformat(),
         }
 
         # Save simulation result to DynamoDB
-        dynamo_client.put_item(SIMULATION_RESULT_TABLE, simulation_result)
+        simulation_result_table.put_item(simulation_result)
+
+        # Add a short-lived download link for the trajectories to the response
+        if trajectory_key:
+            simulation_result["trajectoryUrl"] = s3_client.generate_presigned_url(
+                DATA_BUCKET, trajectory_key
+            )
 
         # Return success response
         return response.success(simulation_result)
@@ -156,10 +222,21 @@ def run_monte_carlo_simulation(
     initial_investment: float,
     num_periods: int,
     num_simulations: int,
+    rng: Optional[np.random.Generator] = None,
+    keep_paths: bool = True,
 ) -> np.ndarray:
     """
     Run Monte Carlo simulation.
 
+    Asset returns are drawn from a multivariate normal distribution so the
+    correlation between assets is preserved. The portfolio is rebalanced to
+    its weights every period, so each period's portfolio return is the
+    weighted sum of the asset returns, compounded along the path.
+    Paths are simulated in float32, which is ample for portfolio values and
+    halves memory traffic. Without keep_paths only the final values are
+    kept, so memory is O(num_simulations) rather than O(num_simulations *
+    num_periods).
+
     Args:
         weights: Portfolio weights
         mean_returns: Mean returns
@@ -167,32 +244,110 @@ def run_monte_carlo_simulation(
         initial_investment: Initial investment
         num_periods: Number of periods
         num_simulations: Number of simulations
+        rng: Optional random number generator (defaults to the shared generator)
+        keep_paths: Whether to return full paths rather than only final values
 
     Returns:
-        np.ndarray: Simulation results
+        np.ndarray: Simulation paths of shape (num_simulations, num_periods + 1),
+            or final values of shape (num_simulations,) without keep_paths (float32)
     """
-    # Calculate portfolio mean and volatility
-    portfolio_mean = np.sum(mean_returns * weights)
-    portfolio_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
+    if rng is None:
+        rng = _RNG
+
+    num_assets = len(weights)
+
+    # Factor the covariance matrix once (in float64) and narrow the inputs. The
+    # transpose of the C-ordered factor is a Fortran-ordered view, so the block
+    # product below is a single sgemm without any transpose copy
+    factor_t = covariance_factor(cov_matrix).astype(np.float32).T
+    mean_returns = mean_returns.astype(np.float32)
+    weights = weights.astype(np.float32)
 
     # Initialize simulation results
-    simulation_results = np.zeros((num_simulations, num_periods + 1))
-    simulation_results[:, 0] = initial_investment
-
-    # Run simulations
-    for i in range(num_simulations):
-        # Generate random returns
-        random_returns = np.random.normal(
-            portfolio_mean, portfolio_volatility, num_periods
+    if keep_paths:
+        simulation_results = np.empty(
+            (num_simulations, num_periods + 1), dtype=np.float32
         )
+        simulation_results[:, 0] = initial_investment
+    else:
+        simulation_results = np.empty(num_simulations, dtype=np.float32)
 
-        # Calculate portfolio value over time
-        for t in range(1, num_periods + 1):
-            simulation_results[i, t] = simulation_results[i, t - 1] * (1 + random_returns[t - 1])
+    # Simulate in blocks so the working set stays bounded for large requests
+    block_size = max(1, MAX_BLOCK_ELEMENTS // (num_periods * num_assets))
+    for start in range(0, num_simulations, block_size):
+        stop = min(start + block_size, num_simulations)
+
+        # Draw correlated asset returns for the whole block in one matrix product
+        shocks = rng.standard_normal(
+            ((stop - start) * num_periods, num_assets), dtype=np.float32
+        )
+        asset_returns = shocks @ factor_t
+        asset_returns += mean_returns
+
+        # Combine into rebalanced portfolio growth (adding 1 after weighting, so
+        # weights summing to slightly less than 1 do not shrink every period)
+        # and compound along the time axis
+        portfolio_growth = (asset_returns @ weights).reshape(stop - start, num_periods)
+        portfolio_growth += 1.0
+        if keep_paths:
+            np.cumprod(portfolio_growth, axis=1, out=portfolio_growth)
+            portfolio_growth *= initial_investment
+            simulation_results[start:stop, 1:] = portfolio_growth
+        else:
+            simulation_results[start:stop] = (
+                np.prod(portfolio_growth, axis=1) * initial_investment
+            )
 
     return simulation_results
 
 
+def save_trajectories(simulation_id: str, simulation_results: np.ndarray) -> str:
+    """
+    Save full simulation trajectories to S3 as a gzipped .npy file.
+
+    Args:
+        simulation_id: Simulation ID
+        simulation_results: Simulation results
+
+    Returns:
+        str: S3 object key
+    """
+    key = f"simulations/{simulation_id}.npy.gz"
+
+    buffer = io.BytesIO()
+    np.save(buffer, simulation_results.astype(np.float32, copy=False))
+
+    # Random paths compress poorly, so favour speed over ratio
+    s3_client.put_object(
+        DATA_BUCKET,
+        key,
+        gzip.compress(buffer.getvalue(), compresslevel=1),
+        content_type="application/octet-stream",
+    )
+
+    return key
+
+
+def covariance_factor(cov_matrix: np.ndarray) -> np.ndarray:
+    """
+    Factor a covariance matrix into L such that L @ L.T == cov_matrix.
+
+    Uses the Cholesky decomposition, falling back to an eigendecomposition for
+    matrices that are only positive semi-definite (e.g. zero-variance assets).
+
+    Args:
+        cov_matrix: Covariance matrix
+
+    Returns:
+        np.ndarray: Covariance factor
+    """
+    try:
+        return np.linalg.cholesky(cov_matrix)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov_matrix)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
 def validate_request(body: Dict[str, Any]) -> List[str]:
     """
     Validate request body.
@@ -238,8 +393,18 @@ def validate_request(body: Dict[str, Any]) -> List[str]:
 
     num_periods = body.get("numPeriods")
     if num_periods is not None and (
-        not isinstance(num_periods, int) or num_periods <= 0
+        not isinstance(num_periods, int) or not 0 < num_periods <= MAX_PERIODS
     ):
-        errors.append("Number of periods must be a positive integer")
+        errors.append(
+            f"Number of periods must be a positive integer of at most {MAX_PERIODS}"
+        )
+
+    seed = body.get("seed")
+    if seed is not None and (not isinstance(seed, int) or seed < 0):
+        errors.append("Seed must be a non-negative integer")
+
+    include_trajectories = body.get("includeTrajectories")
+    if include_trajectories is not None and not isinstance(include_trajectories, bool):
+        errors.append("Include trajectories must be a boolean")
 
     return errors
@@ -4,27 +4,33 @@ Risk Parity Optimization Lambda Function
 This function handles POST requests to the /optimization/risk-parity endpoint.
 """
 
-import json
 import logging
 import os
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
-from scipy.optimize import minimize
+import orjson
 
 from src.lib.db import dynamo_client
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table names from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 OPTIMIZATION_RESULT_TABLE = os.environ.get("OPTIMIZATION_RESULT_TABLE", "")
 
+# Bind table clients at import so they are created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+optimization_result_table = dynamo_client.get_client(OPTIMIZATION_RESULT_TABLE)
+
+# Risk parity solver settings
+MAX_ITERATIONS = 1000
+TOLERANCE = 1e-8
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -37,14 +43,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Running risk parity optimization")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Running risk parity optimization")
+    logger.debug("Event: %s", event)
 
     try:
         # Parse request body
         body = event.get("body", "{}")
         if isinstance(body, str):
-            body = json.loads(body)
+            body = orjson.loads(body)
 
         # Validate request body
         validation_errors = validate_request(body)
@@ -57,7 +63,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         portfolio_id = body.get("portfolioId")
 
         # Get portfolio
-        portfolio = dynamo_client.query_by_id(PORTFOLIO_TABLE, portfolio_id)
+        portfolio = portfolio_table.get_item({"id": portfolio_id})
         if not portfolio:
             return response.not_found("Portfolio", portfolio_id)
 
@@ -73,43 +79,41 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 [f"Returns data missing for assets: {', '.join(missing_returns)}"],
             )
 
-        # Convert returns to numpy arrays
+        # Check if returns have the same length for all assets
         asset_list = list(assets.keys())
-        returns_matrix = []
-        for asset in asset_list:
-            returns_matrix.append(returns[asset])
-        returns_matrix = np.array(returns_matrix)
+        num_observations = len(returns[asset_list[0]])
+        if any(len(returns[asset]) != num_observations for asset in asset_list):
+            return response.validation_error(
+                "Invalid returns data",
+                ["Returns data must have the same length for all assets"],
+            )
+
+        # Convert returns to numpy arrays
+        returns_matrix = np.empty((len(asset_list), num_observations))
+        for i, asset in enumerate(asset_list):
+            returns_matrix[i] = returns[asset]
 
         # Calculate covariance matrix
-        cov_matrix = np.cov(returns_matrix)
+        cov_matrix = np.atleast_2d(np.cov(returns_matrix))
+
+        # Check that every asset has some variance
+        if np.any(np.diag(cov_matrix) <= 0.0):
+            return response.validation_error(
+                "Invalid returns data",
+                ["Returns data must not be constant for any asset"],
+            )
 
         # Run risk parity optimization
-        initial_weights = np.array([1.0 / len(asset_list)] * len(asset_list))
-        bounds = [(0.0, 1.0) for _ in range(len(asset_list))]
-        constraints = [{"type": "eq", "fun": lambda x: np.sum(x) - 1.0}]
-
-        result = minimize(
-            risk_parity_objective,
-            initial_weights,
-            args=(cov_matrix,),
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-            options={"disp": False, "maxiter": 1000},
-        )
+        optimized_weights, converged = solve_risk_parity(cov_matrix)
 
         # Check if optimization was successful
-        if not result.success:
+        if not converged:
             return response.error(
                 500,
                 "OPTIMIZATION_ERROR",
-                f"Optimization failed: {result.message}",
+                f"Optimization failed: did not converge in {MAX_ITERATIONS} iterations",
             )
 
-        # Get optimized weights
-        optimized_weights = result.x
-        optimized_weights = optimized_weights / np.sum(optimized_weights)  # Normalize
-
         # Calculate risk contribution
         portfolio_variance = np.dot(optimized_weights.T, np.dot(cov_matrix, optimized_weights))
         portfolio_volatility = np.sqrt(portfolio_variance)
@@ -122,23 +126,21 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "portfolioId": portfolio_id,
             "type": "risk-parity",
             "parameters": {
-                "method": "SLSQP",
-                "maxIterations": 1000,
+                "method": "CCD",
+                "maxIterations": MAX_ITERATIONS,
             },
             "result": {
-                "weights": {asset: float(weight) for asset, weight in zip(asset_list, optimized_weights)},
+                "weights": dict(zip(asset_list, optimized_weights.tolist())),
                 "metrics": {
                     "portfolioVolatility": float(portfolio_volatility),
-                    "riskContribution": {
-                        asset: float(contrib) for asset, contrib in zip(asset_list, risk_contribution)
-                    },
+                    "riskContribution": dict(zip(asset_list, risk_contribution.tolist())),
                 },
             },
-            "createdAt": datetime.utcnow().isoformat(),
+            "createdAt": datetime.now(timezone.utc).isoformat(),
         }
 
         # Save optimization result to DynamoDB
-        dynamo_client.put_item(OPTIMIZATION_RESULT_TABLE, optimization_result)
+        optimization_result_table.put_item(optimization_result)
 
         # Return success response
         return response.success(optimization_result)
@@ -152,27 +154,51 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
 
-def risk_parity_objective(weights: np.ndarray, cov_matrix: np.ndarray) -> float:
+def solve_risk_parity(
+    cov_matrix: np.ndarray,
+    max_iterations: int = MAX_ITERATIONS,
+    tolerance: float = TOLERANCE,
+) -> Tuple[np.ndarray, bool]:
     """
-    Risk parity objective function.
+    Find equal risk contribution weights by cyclical coordinate descent.
+
+    Minimizes 0.5 * y' C y - sum(log(y)) / n one coordinate at a time, where
+    each coordinate has a closed-form update. The minimizer has equal risk
+    contributions, and normalizing it gives the risk parity weights.
 
     Args:
-        weights: Asset weights
-        cov_matrix: Covariance matrix
+        cov_matrix: Covariance matrix (positive variances)
+        max_iterations: Maximum number of sweeps over all assets
+        tolerance: Maximum relative deviation of risk contributions from their mean
 
     Returns:
-        float: Objective function value
+        Tuple[np.ndarray, bool]: Weights summing to 1.0 and whether the solver converged
     """
-    portfolio_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
-    portfolio_volatility = np.sqrt(portfolio_variance)
-    marginal_contribution = np.dot(cov_matrix, weights)
-    risk_contribution = np.multiply(marginal_contribution, weights) / portfolio_volatility
-    
-    # Calculate the sum of squared differences between risk contributions
-    risk_target = portfolio_volatility / len(weights)
-    sum_sq_diff = np.sum(np.square(risk_contribution - risk_target))
-    
-    return sum_sq_diff
+    num_assets = cov_matrix.shape[0]
+    budget = 1.0 / num_assets
+    variances = np.diag(cov_matrix)
+
+    # Start from inverse-volatility weights
+    weights = 1.0 / np.sqrt(variances)
+    marginal_contribution = cov_matrix @ weights
+
+    converged = False
+    for _ in range(max_iterations):
+        for i in range(num_assets):
+            # Solve the quadratic for coordinate i with the others held fixed
+            others = marginal_contribution[i] - variances[i] * weights[i]
+            updated = (
+                -others + np.sqrt(others * others + 4.0 * variances[i] * budget)
+            ) / (2.0 * variances[i])
+            marginal_contribution += cov_matrix[:, i] * (updated - weights[i])
+            weights[i] = updated
+
+        risk_contribution = weights * marginal_contribution
+        if np.max(np.abs(risk_contribution / risk_contribution.mean() - 1.0)) < tolerance:
+            converged = True
+            break
+
+    return weights / np.sum(weights), converged
 
 
 def validate_request(body: Dict[str, Any]) -> List[str]:
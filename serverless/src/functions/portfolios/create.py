@@ -4,22 +4,28 @@ Create Portfolio Lambda Function
 This function handles POST requests to the /portfolios endpoint.
 """
 
-import json
 import logging
 import os
 from typing import Any, Dict, List
 
+import orjson
+
 from src.lib.db import dynamo_client
 from src.lib.models import portfolio as portfolio_model
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table name from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 
+# Largest request body accepted, in characters
+MAX_BODY_SIZE = 64 * 1024
+
+# Bind the table client at import so it is created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -32,14 +38,16 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Creating portfolio")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Creating portfolio")
+    logger.debug("Event: %s", event)
 
     try:
-        # Parse request body
+        # Parse request body, refusing bodies no portfolio needs
         body = event.get("body", "{}")
         if isinstance(body, str):
-            body = json.loads(body)
+            if len(body) > MAX_BODY_SIZE:
+                return response.bad_request("Request body too large")
+            body = orjson.loads(body)
 
         # Validate request body
         validation_errors = validate_request(body)
@@ -61,8 +69,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Convert to dictionary
         portfolio_dict = portfolio_model.to_dict(portfolio_obj)
 
-        # Save to DynamoDB
-        dynamo_client.put_item(PORTFOLIO_TABLE, portfolio_dict)
+        # Save to DynamoDB, with the index key the API does not expose
+        portfolio_table.put_item(portfolio_model.to_item(portfolio_obj))
 
         # Return success response
         return response.success(portfolio_dict, status_code=201)
@@ -95,12 +103,10 @@ def validate_request(body: Dict[str, Any]) -> List[str]:
     if not assets:
         errors.append("Assets are required")
     else:
-        # Check asset weights
+        # Check asset tickers and weights
         try:
-            total_weight = sum(assets.values())
-            if abs(total_weight - 1.0) > 0.0001:
-                errors.append(f"Asset weights must sum to 1.0, got {total_weight}")
-        except Exception:
-            errors.append("Invalid asset weights")
+            portfolio_model.check_assets(assets)
+        except ValueError as e:
+            errors.append(str(e))
 
     return errors
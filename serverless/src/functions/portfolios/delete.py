@@ -4,21 +4,24 @@ Delete Portfolio Lambda Function
 This function handles DELETE requests to the /portfolios/{id} endpoint.
 """
 
-import json
 import logging
 import os
 from typing import Any, Dict
 
+from boto3.dynamodb.conditions import Attr
+
 from src.lib.db import dynamo_client
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table name from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 
+# Bind the table client at import so it is created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -31,8 +34,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Deleting portfolio")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Deleting portfolio")
+    logger.debug("Event: %s", event)
 
     try:
         # Get portfolio ID from path parameters
@@ -42,13 +45,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not portfolio_id:
             return response.bad_request("Portfolio ID is required")
 
-        # Check if portfolio exists
-        existing_portfolio = dynamo_client.query_by_id(PORTFOLIO_TABLE, portfolio_id)
-        if not existing_portfolio:
-            return response.not_found("Portfolio", portfolio_id)
-
-        # Delete portfolio
-        dynamo_client.delete_item(PORTFOLIO_TABLE, {"id": portfolio_id})
+        # Delete portfolio in one request, failing if it does not exist
+        try:
+            portfolio_table.delete_item(
+                {"id": portfolio_id}, condition_expression=Attr("id").exists()
+            )
+        except Exception as e:
+            if dynamo_client.is_condition_failed(e):
+                return response.not_found("Portfolio", portfolio_id)
+            raise
 
         # Return success response
         return response.success(None, status_code=204)
@@ -4,7 +4,6 @@ Get Portfolio Lambda Function
 This function handles GET requests to the /portfolios/{id} endpoint.
 """
 
-import json
 import logging
 import os
 from typing import Any, Dict
@@ -14,12 +13,14 @@ from src.lib.models import portfolio as portfolio_model
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table name from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 
+# Bind the table client at import so it is created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -32,8 +33,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Getting portfolio by ID")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Getting portfolio by ID")
+    logger.debug("Event: %s", event)
 
     try:
         # Get portfolio ID from path parameters
@@ -44,19 +45,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return response.bad_request("Portfolio ID is required")
 
         # Get portfolio from DynamoDB
-        portfolio_data = dynamo_client.query_by_id(PORTFOLIO_TABLE, portfolio_id)
+        portfolio_data = portfolio_table.get_item({"id": portfolio_id})
 
         if not portfolio_data:
             return response.not_found("Portfolio", portfolio_id)
 
-        # Convert to Portfolio object
-        portfolio_obj = portfolio_model.from_dict(portfolio_data)
-
-        # Convert to dictionary
-        portfolio_dict = portfolio_model.to_dict(portfolio_obj)
-
-        # Return success response
-        return response.success(portfolio_dict)
+        # Return the stored item (validated when written) without its index key
+        return response.success(portfolio_model.to_response(portfolio_data))
 
     except Exception as e:
         logger.error(f"Error getting portfolio: {str(e)}")
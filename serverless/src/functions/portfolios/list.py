@@ -4,22 +4,28 @@ List Portfolios Lambda Function
 This function handles GET requests to the /portfolios endpoint.
 """
 
-import json
 import logging
 import os
 from typing import Any, Dict
 
+from boto3.dynamodb.conditions import Key
+
 from src.lib.db import dynamo_client
 from src.lib.models import portfolio as portfolio_model
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table name from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 
+# Bind the table client at import so it is created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+
+# Index listing portfolios by entity type, newest first
+ENTITY_TYPE_INDEX = "ByEntityType"
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -32,29 +38,42 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Listing portfolios")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Listing portfolios")
+    logger.debug("Event: %s", event)
 
     try:
         # Get query parameters
         query_params = event.get("queryStringParameters", {}) or {}
         limit = int(query_params.get("limit", 100))
 
-        # Get portfolios from DynamoDB
-        portfolios = dynamo_client.scan_items(PORTFOLIO_TABLE, limit=limit)
+        # Continue from the previous page if a token is given
+        next_token = query_params.get("nextToken")
+        try:
+            start_key = dynamo_client.decode_page_token(next_token) if next_token else None
+        except ValueError:
+            return response.bad_request("Invalid nextToken")
 
-        # Convert to Portfolio objects
-        portfolio_objects = [
-            portfolio_model.from_dict(item) for item in portfolios
-        ]
+        # Get one page of portfolios from DynamoDB, newest first (validated when written)
+        portfolios, last_key = portfolio_table.query_page(
+            Key("entity_type").eq(portfolio_model.ENTITY_TYPE),
+            index_name=ENTITY_TYPE_INDEX,
+            limit=limit,
+            scan_index_forward=False,
+            exclusive_start_key=start_key,
+        )
 
-        # Convert to dictionaries
-        portfolio_dicts = [
-            portfolio_model.to_dict(portfolio) for portfolio in portfolio_objects
-        ]
+        # Return the token for the next page in a header so the body stays a list
+        headers = None
+        if last_key:
+            headers = {
+                "X-Next-Token": dynamo_client.encode_page_token(last_key),
+                "Access-Control-Expose-Headers": "X-Next-Token",
+            }
 
         # Return success response
-        return response.success(portfolio_dicts)
+        return response.success(
+            [portfolio_model.to_response(item) for item in portfolios], headers=headers
+        )
 
     except Exception as e:
         logger.error(f"Error listing portfolios: {str(e)}")
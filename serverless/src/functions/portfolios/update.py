@@ -4,22 +4,32 @@ Update Portfolio Lambda Function
 This function handles PUT requests to the /portfolios/{id} endpoint.
 """
 
-import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
+
+import orjson
+from boto3.dynamodb.conditions import Attr
 
 from src.lib.db import dynamo_client
 from src.lib.models import portfolio as portfolio_model
 from src.lib.utils import response
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Get table name from environment variables
 PORTFOLIO_TABLE = os.environ.get("PORTFOLIO_TABLE", "")
 
+# Fields a client may update
+UPDATABLE_FIELDS = ("name", "description", "assets")
+
+# Largest request body accepted, in characters
+MAX_BODY_SIZE = 64 * 1024
+
+# Bind the table client at import so it is created during Lambda init
+portfolio_table = dynamo_client.get_client(PORTFOLIO_TABLE)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -32,8 +42,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict: API Gateway response
     """
-    logger.info("Updating portfolio")
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.debug("Updating portfolio")
+    logger.debug("Event: %s", event)
 
     try:
         # Get portfolio ID from path parameters
@@ -43,44 +53,46 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not portfolio_id:
             return response.bad_request("Portfolio ID is required")
 
-        # Parse request body
+        # Parse request body, refusing bodies no portfolio needs
         body = event.get("body", "{}")
         if isinstance(body, str):
-            body = json.loads(body)
+            if len(body) > MAX_BODY_SIZE:
+                return response.bad_request("Request body too large")
+            body = orjson.loads(body)
 
-        # Validate request body
-        validation_errors = validate_request(body)
-        if validation_errors:
+        # Require at least one field to update
+        if not (body.get("name") or body.get("description") or body.get("assets")):
             return response.validation_error(
-                "Invalid portfolio data", validation_errors
+                "Invalid portfolio data",
+                ["At least one field (name, description, assets) is required"],
             )
 
-        # Get existing portfolio
-        existing_portfolio = dynamo_client.query_by_id(PORTFOLIO_TABLE, portfolio_id)
-        if not existing_portfolio:
-            return response.not_found("Portfolio", portfolio_id)
-
-        # Update portfolio
+        # Validate only the fields that were sent
+        updates = {field: body[field] for field in UPDATABLE_FIELDS if field in body}
         try:
-            # Create updated portfolio object
-            updated_portfolio = portfolio_model.create_portfolio(
-                name=body.get("name", existing_portfolio.get("name", "")),
-                description=body.get("description", existing_portfolio.get("description", "")),
-                assets=body.get("assets", existing_portfolio.get("assets", {})),
-                portfolio_id=portfolio_id,
-                created_at=existing_portfolio.get("created_at"),
-            )
+            for field in ("name", "description"):
+                if field in updates and type(updates[field]) is not str:
+                    raise ValueError(f"{field.capitalize()} must be a string")
+
+            if "assets" in updates:
+                portfolio_model.check_assets(updates["assets"])
         except ValueError as e:
             return response.validation_error("Invalid portfolio data", [str(e)])
 
-        # Convert to dictionary
-        portfolio_dict = portfolio_model.to_dict(updated_portfolio)
-
-        # Save to DynamoDB
-        dynamo_client.put_item(PORTFOLIO_TABLE, portfolio_dict)
+        # Update the fields atomically and in one request
+        try:
+            portfolio_dict = portfolio_table.update_item(
+                {"id": portfolio_id},
+                updates,
+                condition_expression=Attr("id").exists(),
+            )
+        except Exception as e:
+            if dynamo_client.is_condition_failed(e):
+                return response.not_found("Portfolio", portfolio_id)
+            raise
 
         # Return success response
-        return response.success(portfolio_dict)
+        return response.success(portfolio_model.to_response(portfolio_dict))
 
     except Exception as e:
         logger.error(f"Error updating portfolio: {str(e)}")
@@ -88,35 +100,3 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             500, "INTERNAL_SERVER_ERROR", f"Error updating portfolio: {str(e)}"
         )
 
-
-def validate_request(body: Dict[str, Any]) -> List[str]:
-    """
-    Validate request body.
-
-    Args:
-        body: Request body
-
-    Returns:
-        List[str]: Validation errors
-    """
-    errors = []
-
-    # Check if at least one field is provided
-    if not body.get("name") and not body.get("description") and not body.get("assets"):
-        errors.append("At least one field (name, description, assets) is required")
-
-    # Check assets if provided
-    assets = body.get("assets")
-    if assets is not None:
-        if not assets:
-            errors.append("Assets cannot be empty")
-        else:
-            # Check asset weights
-            try:
-                total_weight = sum(assets.values())
-                if abs(total_weight - 1.0) > 0.0001:
-                    errors.append(f"Asset weights must sum to 1.0, got {total_weight}")
-            except Exception:
-                errors.append("Invalid asset weights")
-
-    return errors
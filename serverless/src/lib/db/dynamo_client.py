@@ -4,52 +4,121 @@ DynamoDB Client
 Provides utility functions for interacting with DynamoDB.
 """
 
+import base64
+import binascii
+import functools
 import os
-from typing import Any, Dict, List, Optional, Union
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import boto3
-from boto3.dynamodb.conditions import Key
+import orjson
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Keep connections alive between warm invocations and fail fast on throttling
+_CONFIG = Config(
+    max_pool_connections=10,
+    retries={"max_attempts": 2, "mode": "standard"},
+    tcp_keepalive=True,
+)
+
+# Create a singleton resource shared by all tables
+_DYNAMODB = boto3.resource("dynamodb", config=_CONFIG)
+
+# Maximum number of keys per BatchGetItem request
+BATCH_GET_SIZE = 100
+
+# Attempts for each batch of keys before giving up on unprocessed keys
+BATCH_GET_ATTEMPTS = 5
+
+# Attribute names for portfolio ID queries, which never change
+_PORTFOLIO_ID_NAMES = {"#pid": "portfolioId"}
+
+# Table clients by table name, created on first use and reused across invocations
+_CLIENTS: Dict[str, "DynamoDBClient"] = {}
 
 
 class DynamoDBClient:
-    """Client for interacting with DynamoDB."""
+    """Client for interacting with a DynamoDB table."""
 
-    def __init__(self, table_name: str = None):
+    def __init__(self, table_name: str):
         """
         Initialize DynamoDB client.
 
         Args:
-            table_name: Optional DynamoDB table name
+            table_name: DynamoDB table name
         """
-        self.dynamodb = boto3.resource("dynamodb")
         self.table_name = table_name
-        self.table = self.dynamodb.Table(table_name) if table_name else None
+        self.table = _DYNAMODB.Table(table_name)
 
-    def set_table(self, table_name: str) -> None:
+    def get_item(
+        self, key: Dict[str, Any], attributes: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Set the table to use for operations.
+        Get an item from DynamoDB.
 
         Args:
-            table_name: DynamoDB table name
+            key: Key object (e.g., {"id": "abc123"})
+            attributes: Optional attributes to fetch (default: all)
+
+        Returns:
+            Optional[Dict]: Item from DynamoDB or None if not found
         """
-        self.table_name = table_name
-        self.table = self.dynamodb.Table(table_name)
+        params: Dict[str, Any] = {"Key": key}
 
-    def get_item(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Attribute names are aliased since some (e.g. "name") are reserved words
+        if attributes:
+            names = {f"#{attribute}": attribute for attribute in attributes}
+            params["ProjectionExpression"] = ", ".join(names)
+            params["ExpressionAttributeNames"] = names
+
+        response = self.table.get_item(**params)
+        item = response.get("Item")
+        return from_dynamo(item) if item is not None else None
+
+    def batch_get_items(self, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Get an item from DynamoDB.
+        Get several items from DynamoDB using batch reads.
+
+        Keys are sent in batches of 100 and unprocessed keys are retried with
+        exponential backoff. Items are returned in no particular order and
+        missing items are omitted.
 
         Args:
-            key: Key object (e.g., {"id": "abc123"})
+            keys: Unique key objects (e.g., [{"id": "abc123"}])
 
         Returns:
-            Optional[Dict]: Item from DynamoDB or None if not found
+            List[Dict]: Items from DynamoDB
+
+        Raises:
+            RuntimeError: If some keys are still unprocessed after all attempts
         """
-        if not self.table:
-            raise ValueError("Table not set")
+        items = []
 
-        response = self.table.get_item(Key=key)
-        return response.get("Item")
+        for start in range(0, len(keys), BATCH_GET_SIZE):
+            batch_keys = keys[start : start + BATCH_GET_SIZE]
+            request_items = {self.table_name: {"Keys": to_dynamo(batch_keys)}}
+
+            for attempt in range(BATCH_GET_ATTEMPTS):
+                if attempt:
+                    time.sleep(0.05 * 2**attempt)
+
+                response = _DYNAMODB.batch_get_item(RequestItems=request_items)
+                items.extend(response["Responses"].get(self.table_name, []))
+
+                request_items = response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+            else:
+                raise RuntimeError(
+                    f"Unprocessed keys remain for {self.table_name} "
+                    f"after {BATCH_GET_ATTEMPTS} attempts"
+                )
+
+        return from_dynamo(items)
 
     def put_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -61,14 +130,27 @@ class DynamoDBClient:
         Returns:
             Dict: Response from DynamoDB
         """
-        if not self.table:
-            raise ValueError("Table not set")
-
-        response = self.table.put_item(Item=item)
+        response = self.table.put_item(Item=to_dynamo(item))
         return response
 
+    def put_items(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Put several items in DynamoDB using batch writes.
+
+        Items are sent in batches of 25 and unprocessed items are retried.
+
+        Args:
+            items: Items to put in DynamoDB
+        """
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=to_dynamo(item))
+
     def update_item(
-        self, key: Dict[str, Any], updates: Dict[str, Any]
+        self,
+        key: Dict[str, Any],
+        updates: Dict[str, Any],
+        condition_expression: Any = None,
     ) -> Dict[str, Any]:
         """
         Update an item in DynamoDB.
@@ -76,13 +158,14 @@ class DynamoDBClient:
         Args:
             key: Key object (e.g., {"id": "abc123"})
             updates: Updates to apply
+            condition_expression: Optional condition the item must meet
 
         Returns:
             Dict: Updated item
-        """
-        if not self.table:
-            raise ValueError("Table not set")
 
+        Raises:
+            ClientError: ConditionalCheckFailedException if the condition is not met
+        """
         # Build update expression and attribute values
         update_expressions = []
         expression_attribute_names = {}
@@ -97,43 +180,55 @@ class DynamoDBClient:
             expression_attribute_values[attribute_value] = value
 
         # Add updatedAt timestamp
-        from datetime import datetime
-
-        now = datetime.utcnow().isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         update_expressions.append("#updatedAt = :updatedAt")
         expression_attribute_names["#updatedAt"] = "updated_at"
         expression_attribute_values[":updatedAt"] = now
 
-        response = self.table.update_item(
-            Key=key,
-            UpdateExpression=f"SET {', '.join(update_expressions)}",
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW",
-        )
+        params: Dict[str, Any] = {
+            "Key": key,
+            "UpdateExpression": f"SET {', '.join(update_expressions)}",
+            "ExpressionAttributeNames": expression_attribute_names,
+            "ExpressionAttributeValues": to_dynamo(expression_attribute_values),
+            "ReturnValues": "ALL_NEW",
+        }
+
+        if condition_expression is not None:
+            params["ConditionExpression"] = condition_expression
 
-        return response.get("Attributes", {})
+        response = self.table.update_item(**params)
 
-    def delete_item(self, key: Dict[str, Any]) -> Dict[str, Any]:
+        return from_dynamo(response.get("Attributes", {}))
+
+    def delete_item(
+        self, key: Dict[str, Any], condition_expression: Any = None
+    ) -> Dict[str, Any]:
         """
         Delete an item from DynamoDB.
 
         Args:
             key: Key object (e.g., {"id": "abc123"})
+            condition_expression: Optional condition the item must meet
 
         Returns:
             Dict: Response from DynamoDB
+
+        Raises:
+            ClientError: ConditionalCheckFailedException if the condition is not met
         """
-        if not self.table:
-            raise ValueError("Table not set")
+        params: Dict[str, Any] = {"Key": key}
+
+        if condition_expression is not None:
+            params["ConditionExpression"] = condition_expression
 
-        response = self.table.delete_item(Key=key)
+        response = self.table.delete_item(**params)
         return response
 
     def query_items(
         self,
         key_condition_expression: Any,
         expression_attribute_values: Dict[str, Any] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
         index_name: str = None,
         limit: int = None,
         scan_index_forward: bool = True,
@@ -144,6 +239,7 @@ class DynamoDBClient:
         Args:
             key_condition_expression: Key condition expression
             expression_attribute_values: Expression attribute values
+            expression_attribute_names: Optional expression attribute names
             index_name: Optional index name
             limit: Optional limit
             scan_index_forward: Optional scan direction
@@ -151,15 +247,51 @@ class DynamoDBClient:
         Returns:
             List[Dict]: Items from DynamoDB
         """
-        if not self.table:
-            raise ValueError("Table not set")
+        items, _ = self.query_page(
+            key_condition_expression,
+            expression_attribute_values,
+            expression_attribute_names,
+            index_name,
+            limit,
+            scan_index_forward,
+        )
+        return items
+
+    def query_page(
+        self,
+        key_condition_expression: Any,
+        expression_attribute_values: Dict[str, Any] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        index_name: str = None,
+        limit: int = None,
+        scan_index_forward: bool = True,
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Query one page of items from DynamoDB.
 
+        Args:
+            key_condition_expression: Key condition expression
+            expression_attribute_values: Expression attribute values
+            expression_attribute_names: Optional expression attribute names
+            index_name: Optional index name
+            limit: Optional limit
+            scan_index_forward: Optional scan direction
+            exclusive_start_key: Optional key to continue a previous query from
+
+        Returns:
+            Tuple[List[Dict], Optional[Dict]]: Items and the key to continue
+                from, or None on the last page
+        """
         params: Dict[str, Any] = {
             "KeyConditionExpression": key_condition_expression,
         }
 
         if expression_attribute_values:
-            params["ExpressionAttributeValues"] = expression_attribute_values
+            params["ExpressionAttributeValues"] = to_dynamo(expression_attribute_values)
+
+        if expression_attribute_names:
+            params["ExpressionAttributeNames"] = expression_attribute_names
 
         if index_name:
             params["IndexName"] = index_name
@@ -170,8 +302,16 @@ class DynamoDBClient:
         if scan_index_forward is not None:
             params["ScanIndexForward"] = scan_index_forward
 
+        if exclusive_start_key:
+            params["ExclusiveStartKey"] = to_dynamo(exclusive_start_key)
+
         response = self.table.query(**params)
-        return response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+
+        return (
+            from_dynamo(response.get("Items", [])),
+            from_dynamo(last_key) if last_key else None,
+        )
 
     def scan_items(
         self,
@@ -190,32 +330,142 @@ class DynamoDBClient:
         Returns:
             List[Dict]: Items from DynamoDB
         """
-        if not self.table:
-            raise ValueError("Table not set")
-
         params: Dict[str, Any] = {}
 
         if filter_expression:
             params["FilterExpression"] = filter_expression
 
         if expression_attribute_values:
-            params["ExpressionAttributeValues"] = expression_attribute_values
+            params["ExpressionAttributeValues"] = to_dynamo(expression_attribute_values)
 
         if limit:
             params["Limit"] = limit
 
         response = self.table.scan(**params)
-        return response.get("Items", [])
+        return from_dynamo(response.get("Items", []))
+
+
+def to_dynamo(value: Any) -> Any:
+    """
+    Convert floats to Decimals, which is the only number type DynamoDB accepts.
+
+    Args:
+        value: Value to convert (dicts and lists are converted recursively)
+
+    Returns:
+        Any: Converted value
+    """
+    if isinstance(value, float):
+        return Decimal(str(value))
 
+    if isinstance(value, dict):
+        return {k: to_dynamo(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [to_dynamo(v) for v in value]
+
+    return value
+
+
+def from_dynamo(value: Any) -> Any:
+    """
+    Convert Decimals read from DynamoDB back to ints and floats.
+
+    Args:
+        value: Value to convert (dicts and lists are converted recursively)
+
+    Returns:
+        Any: Converted value
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
 
-# Create a singleton instance
-dynamo_client = DynamoDBClient()
+    if isinstance(value, dict):
+        return {k: from_dynamo(v) for k, v in value.items()}
 
+    if isinstance(value, list):
+        return [from_dynamo(v) for v in value]
 
+    return value
+
+
+def encode_page_token(last_key: Dict[str, Any]) -> str:
+    """
+    Encode a LastEvaluatedKey as an opaque, URL-safe page token.
+
+    Args:
+        last_key: LastEvaluatedKey from a query
+
+    Returns:
+        str: Page token
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(last_key)).decode()
+
+
+def decode_page_token(token: str) -> Dict[str, Any]:
+    """
+    Decode a page token back into an ExclusiveStartKey.
+
+    Args:
+        token: Page token from encode_page_token
+
+    Returns:
+        Dict: ExclusiveStartKey
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        last_key = orjson.loads(base64.urlsafe_b64decode(token))
+    except (binascii.Error, orjson.JSONDecodeError) as e:
+        raise ValueError(f"Invalid page token: {token}") from e
+
+    if not isinstance(last_key, dict):
+        raise ValueError(f"Invalid page token: {token}")
+
+    return last_key
+
+
+def is_condition_failed(error: Exception) -> bool:
+    """
+    Check whether an error is a failed condition expression.
+
+    Args:
+        error: Error raised by a DynamoDB call
+
+    Returns:
+        bool: True if the condition expression was not met
+    """
+    return (
+        isinstance(error, ClientError)
+        and error.response["Error"]["Code"] == "ConditionalCheckFailedException"
+    )
+
+
+def get_client(table_name: str) -> DynamoDBClient:
+    """
+    Get the cached client for a table.
+
+    Args:
+        table_name: DynamoDB table name
+
+    Returns:
+        DynamoDBClient: Client bound to the table
+    """
+    client = _CLIENTS.get(table_name)
+    if client is None:
+        client = _CLIENTS[table_name] = DynamoDBClient(table_name)
+    return client
+
+
+@functools.lru_cache(maxsize=16)
 def get_table_name(table_key: str) -> str:
     """
     Get the full table name from environment variables.
 
+    Environment variables do not change for the life of the execution
+    environment, so each lookup is cached.
+
     Args:
         table_key: Table key (e.g., "PORTFOLIO_TABLE")
 
@@ -225,19 +475,37 @@ def get_table_name(table_key: str) -> str:
     return os.environ.get(table_key, "")
 
 
-def get_item(table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def get_item(
+    table_name: str, key: Dict[str, Any], attributes: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Get an item from DynamoDB.
 
     Args:
         table_name: DynamoDB table name
         key: Key object (e.g., {"id": "abc123"})
+        attributes: Optional attributes to fetch (default: all)
 
     Returns:
         Optional[Dict]: Item from DynamoDB or None if not found
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.get_item(key)
+    return get_client(table_name).get_item(key, attributes)
+
+
+def batch_get_items(
+    table_name: str, keys: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Get several items from DynamoDB using batch reads.
+
+    Args:
+        table_name: DynamoDB table name
+        keys: Unique key objects (e.g., [{"id": "abc123"}])
+
+    Returns:
+        List[Dict]: Items from DynamoDB, in no particular order
+    """
+    return get_client(table_name).batch_get_items(keys)
 
 
 def put_item(table_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
@@ -251,12 +519,25 @@ def put_item(table_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict: Response from DynamoDB
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.put_item(item)
+    return get_client(table_name).put_item(item)
+
+
+def put_items(table_name: str, items: List[Dict[str, Any]]) -> None:
+    """
+    Put several items in DynamoDB using batch writes.
+
+    Args:
+        table_name: DynamoDB table name
+        items: Items to put in DynamoDB
+    """
+    get_client(table_name).put_items(items)
 
 
 def update_item(
-    table_name: str, key: Dict[str, Any], updates: Dict[str, Any]
+    table_name: str,
+    key: Dict[str, Any],
+    updates: Dict[str, Any],
+    condition_expression: Any = None,
 ) -> Dict[str, Any]:
     """
     Update an item in DynamoDB.
@@ -265,33 +546,36 @@ def update_item(
         table_name: DynamoDB table name
         key: Key object (e.g., {"id": "abc123"})
         updates: Updates to apply
+        condition_expression: Optional condition the item must meet
 
     Returns:
         Dict: Updated item
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.update_item(key, updates)
+    return get_client(table_name).update_item(key, updates, condition_expression)
 
 
-def delete_item(table_name: str, key: Dict[str, Any]) -> Dict[str, Any]:
+def delete_item(
+    table_name: str, key: Dict[str, Any], condition_expression: Any = None
+) -> Dict[str, Any]:
     """
     Delete an item from DynamoDB.
 
     Args:
         table_name: DynamoDB table name
         key: Key object (e.g., {"id": "abc123"})
+        condition_expression: Optional condition the item must meet
 
     Returns:
         Dict: Response from DynamoDB
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.delete_item(key)
+    return get_client(table_name).delete_item(key, condition_expression)
 
 
 def query_items(
     table_name: str,
     key_condition_expression: Any,
     expression_attribute_values: Dict[str, Any] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
     index_name: str = None,
     limit: int = None,
     scan_index_forward: bool = True,
@@ -303,6 +587,7 @@ def query_items(
         table_name: DynamoDB table name
         key_condition_expression: Key condition expression
         expression_attribute_values: Expression attribute values
+        expression_attribute_names: Optional expression attribute names
         index_name: Optional index name
         limit: Optional limit
         scan_index_forward: Optional scan direction
@@ -310,13 +595,51 @@ def query_items(
     Returns:
         List[Dict]: Items from DynamoDB
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.query_items(
+    return get_client(table_name).query_items(
+        key_condition_expression,
+        expression_attribute_values,
+        expression_attribute_names,
+        index_name,
+        limit,
+        scan_index_forward,
+    )
+
+
+def query_page(
+    table_name: str,
+    key_condition_expression: Any,
+    expression_attribute_values: Dict[str, Any] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    index_name: str = None,
+    limit: int = None,
+    scan_index_forward: bool = True,
+    exclusive_start_key: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Query one page of items from DynamoDB.
+
+    Args:
+        table_name: DynamoDB table name
+        key_condition_expression: Key condition expression
+        expression_attribute_values: Expression attribute values
+        expression_attribute_names: Optional expression attribute names
+        index_name: Optional index name
+        limit: Optional limit
+        scan_index_forward: Optional scan direction
+        exclusive_start_key: Optional key to continue a previous query from
+
+    Returns:
+        Tuple[List[Dict], Optional[Dict]]: Items and the key to continue from,
+            or None on the last page
+    """
+    return get_client(table_name).query_page(
         key_condition_expression,
         expression_attribute_values,
+        expression_attribute_names,
         index_name,
         limit,
         scan_index_forward,
+        exclusive_start_key,
     )
 
 
@@ -338,8 +661,7 @@ def scan_items(
     Returns:
         List[Dict]: Items from DynamoDB
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.scan_items(
+    return get_client(table_name).scan_items(
         filter_expression, expression_attribute_values, limit
     )
 
@@ -372,9 +694,9 @@ def query_by_portfolio_id(
     Returns:
         List[Dict]: Items from DynamoDB
     """
-    dynamo_client.set_table(table_name)
-    return dynamo_client.query_items(
-        Key("portfolioId").eq(portfolio_id),
-        expression_attribute_values=None,
+    return get_client(table_name).query_items(
+        "#pid = :pid",
+        expression_attribute_values={":pid": portfolio_id},
+        expression_attribute_names=_PORTFOLIO_ID_NAMES,
         index_name=index_name,
     )
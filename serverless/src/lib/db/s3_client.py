@@ -0,0 +1,62 @@
+"""
+S3 Client
+
+Provides utility functions for interacting with S3.
+"""
+
+from typing import Any, Dict, Optional
+
+import boto3
+
+# Create a singleton client
+s3 = boto3.client("s3")
+
+
+def put_object(
+    bucket: str,
+    key: str,
+    body: bytes,
+    content_type: Optional[str] = None,
+    content_encoding: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Put an object in S3.
+
+    Args:
+        bucket: S3 bucket name
+        key: Object key
+        body: Object content
+        content_type: Optional content type
+        content_encoding: Optional content encoding
+
+    Returns:
+        Dict: Response from S3
+    """
+    params: Dict[str, Any] = {"Bucket": bucket, "Key": key, "Body": body}
+
+    if content_type:
+        params["ContentType"] = content_type
+
+    if content_encoding:
+        params["ContentEncoding"] = content_encoding
+
+    return s3.put_object(**params)
+
+
+def generate_presigned_url(bucket: str, key: str, expires_in: int = 3600) -> str:
+    """
+    Generate a presigned URL for downloading an object.
+
+    Args:
+        bucket: S3 bucket name
+        key: Object key
+        expires_in: URL lifetime in seconds
+
+    Returns:
+        str: Presigned URL
+    """
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=expires_in,
+    )
@@ -4,46 +4,85 @@ Portfolio Model
 Defines the structure and validation for portfolio objects.
 """
 
+import math
 import uuid
-from datetime import datetime
-from typing import Dict, Optional
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field, field_validator
+# Partition key value for the ByEntityType index, which lists portfolios by creation time
+ENTITY_TYPE = "portfolio"
 
+# Allowed difference between the sum of asset weights and 1.0
+WEIGHT_SUM_TOLERANCE = 0.0001
 
-class Portfolio(BaseModel):
+
+def _now() -> str:
+    """
+    Get the current UTC time as an ISO 8601 timestamp.
+
+    Returns:
+        str: Current timestamp
+    """
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(kw_only=True)
+class Portfolio:
     """Portfolio model for investment portfolios."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
     name: str
     description: str = ""
     assets: Dict[str, float]
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now)
+    updated_at: str = field(default_factory=_now)
+
+    def __post_init__(self) -> None:
+        """Validate the portfolio fields."""
+        for name in ("id", "name", "description", "created_at", "updated_at"):
+            if type(getattr(self, name)) is not str:
+                raise ValueError(f"Invalid {name}: {getattr(self, name)!r}")
+
+        check_assets(self.assets)
+
+
+# Names of the Portfolio fields, for ignoring unknown keys in stored items
+_FIELD_NAMES = frozenset(f.name for f in fields(Portfolio))
+
+# Attributes kept only in the stored item (index keys), never returned by the API
+STORAGE_ONLY_FIELDS = frozenset({"entity_type"})
+
+
+def check_assets(assets: Dict[str, float]) -> None:
+    """
+    Validate asset tickers and weights in a single pass.
+
+    Args:
+        assets: Dictionary of assets and their weights
 
-    @field_validator("assets")
-    @classmethod
-    def validate_assets(cls, assets: Dict[str, float]) -> Dict[str, float]:
-        """Validate that asset weights sum to 1.0."""
-        if not assets:
-            raise ValueError("Assets cannot be empty")
+    Raises:
+        ValueError: If the assets are empty, a ticker or weight is invalid, or
+            the weights do not sum to 1.0
+    """
+    if not assets:
+        raise ValueError("Assets cannot be empty")
 
-        # Validate asset tickers
-        for ticker in assets.keys():
-            if not isinstance(ticker, str) or len(ticker) > 10:
-                raise ValueError(f"Invalid ticker: {ticker}")
+    if type(assets) is not dict:
+        raise ValueError("Assets must be a dictionary")
 
-        # Validate asset weights
-        for ticker, weight in assets.items():
-            if not isinstance(weight, (int, float)) or weight < 0 or weight > 1:
-                raise ValueError(f"Invalid weight for {ticker}: {weight}")
+    # Validate asset tickers and weights (exact type checks also reject booleans)
+    for ticker, weight in assets.items():
+        if type(ticker) is not str or len(ticker) > 10:
+            raise ValueError(f"Invalid ticker: {ticker}")
 
-        # Validate that weights sum to 1.0
-        total_weight = sum(assets.values())
-        if abs(total_weight - 1.0) > 0.0001:
-            raise ValueError(f"Asset weights must sum to 1.0, got {total_weight}")
+        if type(weight) not in (int, float) or weight < 0 or weight > 1:
+            raise ValueError(f"Invalid weight for {ticker}: {weight}")
 
-        return assets
+    # Validate that weights sum to 1.0 (fsum does not accumulate rounding error)
+    total_weight = math.fsum(assets.values())
+    if abs(total_weight - 1.0) > WEIGHT_SUM_TOLERANCE:
+        raise ValueError(f"Asset weights must sum to 1.0, got {total_weight}")
 
 
 def create_portfolio(
@@ -68,9 +107,10 @@ def create_portfolio(
     Returns:
         Portfolio: A new Portfolio object
     """
-    now = datetime.utcnow().isoformat()
+    # Take one timestamp so both defaults agree and the field factories never run
+    now = _now()
     return Portfolio(
-        id=portfolio_id or str(uuid.uuid4()),
+        id=portfolio_id or uuid.uuid4().hex,
         name=name,
         description=description,
         assets=assets,
@@ -87,19 +127,45 @@ def to_dict(portfolio: Portfolio) -> Dict:
         portfolio: Portfolio object
 
     Returns:
-        Dict: Dictionary representation of the portfolio
+        Dict: Dictionary representation of the portfolio (shares the assets dict)
+    """
+    return dict(vars(portfolio))
+
+
+def to_item(portfolio: Portfolio) -> Dict:
+    """
+    Convert a Portfolio object to the item stored in DynamoDB.
+
+    Args:
+        portfolio: Portfolio object
+
+    Returns:
+        Dict: Stored item, including the ByEntityType index key
+    """
+    return {**vars(portfolio), "entity_type": ENTITY_TYPE}
+
+
+def to_response(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a stored portfolio item to its API representation.
+
+    Args:
+        item: Stored item
+
+    Returns:
+        Dict: Item without storage-only attributes
     """
-    return portfolio.model_dump()
+    return {k: v for k, v in item.items() if k not in STORAGE_ONLY_FIELDS}
 
 
-def from_dict(data: Dict) -> Portfolio:
+def from_dict(data: Dict[str, Any]) -> Portfolio:
     """
     Create a Portfolio object from a dictionary.
 
     Args:
-        data: Dictionary representation of a portfolio
+        data: Dictionary representation of a portfolio (unknown keys are ignored)
 
     Returns:
         Portfolio: Portfolio object
     """
-    return Portfolio(**data)
+    return Portfolio(**{k: v for k, v in data.items() if k in _FIELD_NAMES})
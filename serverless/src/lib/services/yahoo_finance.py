@@ -0,0 +1,273 @@
+"""
+Yahoo Finance Service
+
+Provides utility functions for downloading price history from Yahoo Finance.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+# Maximum number of concurrent requests (and pooled connections)
+MAX_WORKERS = 20
+
+# Request timeout in seconds
+REQUEST_TIMEOUT = 10
+
+# Ordinal of the Unix epoch, for turning timestamps into dates
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Directory for cached price history (/tmp persists while the execution environment is warm)
+CACHE_DIR = os.environ.get("YAHOO_FINANCE_CACHE_DIR", "/tmp/yahoo-finance-cache")
+
+# Seconds a cached range is served before it is downloaded again (adjusted prices
+# of past days are rewritten after every split and dividend)
+CACHE_TTL = int(os.environ.get("YAHOO_FINANCE_CACHE_TTL", 24 * 60 * 60))
+
+# Create a singleton session so connections stay warm across invocations
+session = requests.Session()
+session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; stratigos/1.0)"})
+session.mount(
+    "https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+)
+
+
+def get_price_history(
+    symbol: str, start_date: str, end_date: str, interval: str
+) -> Optional[Dict[str, List[Any]]]:
+    """
+    Get split- and dividend-adjusted price history for a symbol.
+
+    Ranges that end on or before today have all their rows, so they are
+    cached in memory and on disk. Their adjusted prices still change after
+    later splits and dividends, so cached ranges may be up to CACHE_TTL
+    seconds stale. The result must not be modified.
+
+    Args:
+        symbol: Symbol
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD, exclusive)
+        interval: Price interval (1d, 1wk, 1mo)
+
+    Returns:
+        Optional[Dict]: Dates and OHLCV lists, or None if no data was found or
+            the download failed
+    """
+    # Failures are caught here rather than in the download, so the memory cache
+    # never remembers a transient error
+    try:
+        if end_date > datetime.now(timezone.utc).strftime("%Y-%m-%d"):
+            return _download_price_history(symbol, start_date, end_date, interval)
+
+        # Keying the memory cache on the TTL period expires its entries with the files
+        ttl_period = int(time.time() // CACHE_TTL)
+        return _get_cached_price_history(
+            symbol, start_date, end_date, interval, ttl_period
+        )
+    except requests.RequestException as e:
+        logger.warning(f"Could not download price history for {symbol}: {str(e)}")
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _get_cached_price_history(
+    symbol: str, start_date: str, end_date: str, interval: str, ttl_period: int
+) -> Optional[Dict[str, List[Any]]]:
+    """
+    Get price history from the disk cache, downloading it on a miss or expiry.
+
+    Args:
+        symbol: Symbol
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD, exclusive)
+        interval: Price interval (1d, 1wk, 1mo)
+        ttl_period: Current CACHE_TTL period (only part of the memory cache key)
+
+    Returns:
+        Optional[Dict]: Dates and OHLCV lists, or None if no data was found
+    """
+    cache_key = hashlib.sha256(
+        f"{symbol}|{start_date}|{end_date}|{interval}".encode()
+    ).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{cache_key}.json")
+
+    try:
+        if time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+            with open(cache_path) as cache_file:
+                return json.load(cache_file)
+    except (OSError, ValueError):
+        pass
+
+    prices = _download_price_history(symbol, start_date, end_date, interval)
+    if prices is None:
+        return None
+
+    # Write to a temporary file first so concurrent readers never see a partial file
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as cache_file:
+            json.dump(prices, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache price history for {symbol}: {str(e)}")
+
+    return prices
+
+
+def _download_price_history(
+    symbol: str, start_date: str, end_date: str, interval: str
+) -> Optional[Dict[str, List[Any]]]:
+    """
+    Download price history for a symbol from the chart API.
+
+    Args:
+        symbol: Symbol
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD, exclusive)
+        interval: Price interval (1d, 1wk, 1mo)
+
+    Returns:
+        Optional[Dict]: Dates and OHLCV lists, or None if no data was found
+    """
+    # Escape the symbol so it cannot change the request path
+    response = session.get(
+        CHART_URL.format(symbol=quote(symbol, safe="")),
+        params={
+            "period1": _to_timestamp(start_date),
+            "period2": _to_timestamp(end_date),
+            "interval": interval,
+            "events": "div,splits",
+            "includeAdjustedClose": "true",
+        },
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    if response.status_code == 404:
+        logger.warning(f"No price data found for {symbol}")
+        return None
+
+    response.raise_for_status()
+
+    results = response.json()["chart"]["result"]
+    if not results or not results[0].get("timestamp"):
+        logger.warning(f"No price data found for {symbol}")
+        return None
+
+    return _parse_chart(results[0])
+
+
+def get_price_histories(
+    symbols: List[str], start_date: str, end_date: str, interval: str
+) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Get price history for several symbols concurrently.
+
+    Args:
+        symbols: List of symbols
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD, exclusive)
+        interval: Price interval (1d, 1wk, 1mo)
+
+    Returns:
+        Dict: Price history by symbol (symbols without data are omitted)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(symbols))) as executor:
+        histories = executor.map(
+            lambda symbol: get_price_history(symbol, start_date, end_date, interval),
+            symbols,
+        )
+
+        return {
+            symbol: history
+            for symbol, history in zip(symbols, histories)
+            if history is not None
+        }
+
+
+def _to_timestamp(date_str: str) -> int:
+    """
+    Convert a YYYY-MM-DD date to a UTC epoch timestamp.
+
+    Args:
+        date_str: Date (YYYY-MM-DD)
+
+    Returns:
+        int: Epoch timestamp in seconds
+    """
+    return (date.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL) * 86400
+
+
+def _parse_chart(chart: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Parse a chart result into adjusted OHLCV lists.
+
+    Prices are scaled by the ratio of adjusted close to close, and rows
+    without a non-zero close price are dropped.
+
+    Args:
+        chart: Chart result from Yahoo Finance
+
+    Returns:
+        Dict: Dates and OHLCV lists
+    """
+    gmt_offset = chart["meta"].get("gmtoffset", 0)
+    quote = chart["indicators"]["quote"][0]
+    adjusted_close = chart["indicators"].get("adjclose", [{}])[0].get("adjclose")
+    if adjusted_close is None:
+        adjusted_close = quote["close"]
+
+    prices: Dict[str, List[Any]] = {
+        "dates": [],
+        "open": [],
+        "high": [],
+        "low": [],
+        "close": [],
+        "volume": [],
+    }
+
+    rows = zip(
+        chart["timestamp"],
+        quote["open"],
+        quote["high"],
+        quote["low"],
+        quote["close"],
+        adjusted_close,
+        quote["volume"],
+    )
+    for timestamp, open_, high, low, close, adj_close, volume in rows:
+        # Skip rows without a usable close (halted or delisted tickers report 0)
+        if not close or adj_close is None:
+            continue
+
+        ratio = adj_close / close
+
+        # Exchange-local trading day, without building a datetime per row
+        day = date.fromordinal(EPOCH_ORDINAL + (timestamp + gmt_offset) // 86400)
+
+        prices["dates"].append(day.isoformat())
+        prices["open"].append(open_ * ratio if open_ is not None else None)
+        prices["high"].append(high * ratio if high is not None else None)
+        prices["low"].append(low * ratio if low is not None else None)
+        prices["close"].append(adj_close)
+        prices["volume"].append(volume)
+
+    return prices
@@ -0,0 +1,31 @@
+"""
+Date Utility
+
+Provides utility functions for parsing dates in API parameters.
+"""
+
+import re
+from datetime import date
+from typing import Optional
+
+# Accepted date format (date.fromisoformat alone also takes compact and week dates)
+DATE_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def parse_date(value: str) -> Optional[date]:
+    """
+    Parse a YYYY-MM-DD date.
+
+    Args:
+        value: Date string
+
+    Returns:
+        Optional[date]: Parsed date, or None if it is not a valid YYYY-MM-DD date
+    """
+    if not DATE_PATTERN.fullmatch(value):
+        return None
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
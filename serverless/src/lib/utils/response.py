@@ -4,9 +4,40 @@ Response Utility
 Provides utility functions for formatting API responses.
 """
 
-import json
 from typing import Any, Dict, List, Optional, Union
 
+import orjson
+
+# Default headers, built once and copied into every response
+_DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
+}
+
+
+def _response(
+    status_code: int, body: str, headers: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Create an API Gateway response.
+
+    Args:
+        status_code: HTTP status code
+        body: Serialized response body
+        headers: Optional HTTP headers, merged over the defaults
+
+    Returns:
+        Dict: API Gateway response
+    """
+    # Copy the defaults so a caller changing headers never affects later responses
+    merged_headers = dict(_DEFAULT_HEADERS)
+    if headers:
+        merged_headers.update(headers)
+
+    return {"statusCode": status_code, "headers": merged_headers, "body": body}
+
 
 def success(
     data: Union[Dict[str, Any], List[Dict[str, Any]], None] = None,
@@ -24,25 +55,14 @@ def success(
     Returns:
         Dict: API Gateway response
     """
-    # Default headers
-    default_headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
-    }
-
-    # Merge headers
-    response_headers = {**default_headers, **(headers or {})}
+    # No Content responses must not have a body
+    if status_code == 204:
+        return _response(status_code, "", headers)
 
     # Create response
     response_body = data if data is not None else {}
-    
-    return {
-        "statusCode": status_code,
-        "headers": response_headers,
-        "body": json.dumps(response_body),
-    }
+
+    return _response(status_code, orjson.dumps(response_body).decode(), headers)
 
 
 def error(
@@ -65,17 +85,6 @@ def error(
     Returns:
         Dict: API Gateway response
     """
-    # Default headers
-    default_headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
-    }
-
-    # Merge headers
-    response_headers = {**default_headers, **(headers or {})}
-
     # Create error response
     error_response = {
         "error": {
@@ -88,11 +97,7 @@ def error(
     if details:
         error_response["error"]["details"] = details
 
-    return {
-        "statusCode": status_code,
-        "headers": response_headers,
-        "body": json.dumps(error_response),
-    }
+    return _response(status_code, orjson.dumps(error_response).decode(), headers)
 
 
 def not_found(
@@ -1,5 +1,15 @@
+"""
+API endpoint tests for the portfolio API.
+
+Each test runs against canned responses and, when selected with
+``pytest -m network``, against the deployed API.
+"""
+
+import re
+
+import pytest
 import requests
-import json
+import responses
 
 # API endpoint and authentication details
 BASE_URL = "https://d0jnykdrcc.execute-api.us-east-1.amazonaws.com/dev"
@@ -9,91 +19,92 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Reuse one session so every request shares a kept-alive connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
+PORTFOLIO_PAYLOAD = {
+    "name": "Test Portfolio",
+    "description": "A test portfolio created via API",
+    "assets": {
+        "AAPL": 0.25,
+        "MSFT": 0.25,
+        "GOOGL": 0.20,
+        "AMZN": 0.20,
+        "META": 0.10
+    }
+}
+
+CANNED_PORTFOLIO = {
+    "id": "p-123456",
+    **PORTFOLIO_PAYLOAD,
+    "created_at": "2025-06-28T12:34:56+00:00",
+    "updated_at": "2025-06-28T12:34:56+00:00",
+}
+
+
+@pytest.fixture(
+    autouse=True,
+    params=["mocked", pytest.param("live", marks=pytest.mark.network)],
+)
+def api_mode(request):
+    """Answer requests with canned responses, or send them to the deployed API."""
+    if request.param == "live":
+        yield request.param
+        return
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.get(f"{BASE_URL}/portfolios", json=[CANNED_PORTFOLIO])
+        rsps.post(f"{BASE_URL}/portfolios", json=CANNED_PORTFOLIO, status=201)
+        rsps.get(
+            re.compile(rf"{re.escape(BASE_URL)}/portfolios/[^/]+"),
+            json=CANNED_PORTFOLIO,
+        )
+        yield request.param
+
+
+@pytest.fixture
+def portfolio_id(api_mode):
+    """Create a portfolio and return its ID."""
+    response = create_portfolio()
+    assert response.status_code in (200, 201), response.text[:500]
+    return response.json()["id"]
+
+
+def list_portfolios():
+    """Call GET /portfolios to list all portfolios."""
+    return SESSION.get(f"{BASE_URL}/portfolios")
+
+
+def create_portfolio():
+    """Call POST /portfolios to create a new portfolio."""
+    return SESSION.post(f"{BASE_URL}/portfolios", json=PORTFOLIO_PAYLOAD)
+
+
+def get_portfolio(portfolio_id):
+    """Call GET /portfolios/{id} to retrieve a specific portfolio."""
+    return SESSION.get(f"{BASE_URL}/portfolios/{portfolio_id}")
+
+
 def test_list_portfolios():
     """Test the GET /portfolios endpoint to list all portfolios."""
-    url = f"{BASE_URL}/portfolios"
-    response = requests.get(url, headers=HEADERS)
-    
-    print("Testing GET /portfolios")
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 200:
-        print("Response Body:", json.dumps(response.json(), indent=2)[:500] + "...")
-        print("Result: SUCCESS\n")
-    else:
-        print("Response Body:", response.text[:500] + "...")
-        print("Result: FAILURE\n")
-    return response.status_code == 200
+    response = list_portfolios()
+
+    assert response.status_code == 200, response.text[:500]
+    assert isinstance(response.json(), list)
+
 
 def test_create_portfolio():
     """Test the POST /portfolios endpoint to create a new portfolio."""
-    url = f"{BASE_URL}/portfolios"
-    payload = {
-        "name": "Test Portfolio",
-        "description": "A test portfolio created via API",
-        "assets": {
-            "AAPL": 0.25,
-            "MSFT": 0.25,
-            "GOOGL": 0.20,
-            "AMZN": 0.20,
-            "META": 0.10
-        }
-    }
-    response = requests.post(url, headers=HEADERS, json=payload)
-    
-    print("Testing POST /portfolios")
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 200 or response.status_code == 201:
-        print("Response Body:", json.dumps(response.json(), indent=2)[:500] + "...")
-        print("Result: SUCCESS\n")
-        return True, response.json().get('id')
-    else:
-        print("Response Body:", response.text[:500] + "...")
-        print("Result: FAILURE\n")
-        return False, None
+    response = create_portfolio()
+
+    assert response.status_code in (200, 201), response.text[:500]
+    assert response.json().get("id")
+
 
 def test_get_portfolio(portfolio_id):
     """Test the GET /portfolios/{id} endpoint to retrieve a specific portfolio."""
-    if not portfolio_id:
-        print("Testing GET /portfolios/{id}")
-        print("Result: SKIPPED (No portfolio ID provided)\n")
-        return False
-    
-    url = f"{BASE_URL}/portfolios/{portfolio_id}"
-    response = requests.get(url, headers=HEADERS)
-    
-    print(f"Testing GET /portfolios/{portfolio_id}")
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 200:
-        print("Response Body:", json.dumps(response.json(), indent=2)[:500] + "...")
-        print("Result: SUCCESS\n")
-    else:
-        print("Response Body:", response.text[:500] + "...")
-        print("Result: FAILURE\n")
-    return response.status_code == 200
-
-def main():
-    """Run all API tests and summarize results."""
-    print("Starting API Tests for Stratigos AI Platform\n")
-    
-    results = []
-    
-    # Test 1: List Portfolios
-    results.append(("List Portfolios", test_list_portfolios()))
-    
-    # Test 2: Create Portfolio
-    success, portfolio_id = test_create_portfolio()
-    results.append(("Create Portfolio", success))
-    
-    # Test 3: Get Portfolio (using ID from create if successful)
-    results.append(("Get Portfolio", test_get_portfolio(portfolio_id)))
-    
-    # Summarize Results
-    print("API Test Summary")
-    print("----------------")
-    for test_name, success in results:
-        print(f"{test_name}: {'SUCCESS' if success else 'FAILURE'}")
-    print("----------------")
-    print("API Testing Completed\n")
-
-if __name__ == "__main__":
-    main()
+    response = get_portfolio(portfolio_id)
+
+    assert response.status_code == 200, response.text[:500]
+    assert response.json()["id"] == portfolio_id
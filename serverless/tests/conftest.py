@@ -0,0 +1,30 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+import time
+
+import boto3
+import pytest
+from moto import mock_dynamodb
+
+# Handler modules create boto3 resources at import time, which requires a region
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+# Mocked services answer at once, so clients without their own config skip retries
+os.environ.setdefault("AWS_RETRY_MODE", "standard")
+os.environ.setdefault("AWS_MAX_ATTEMPTS", "1")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Make retry backoff instant; nothing under test needs real waits."""
+    monkeypatch.setattr(time, "sleep", lambda *args: None)
+
+
+@pytest.fixture(scope="session")
+def dynamodb_resource():
+    """Start the DynamoDB mock once and share one resource across all tests."""
+    with mock_dynamodb():
+        yield boto3.resource("dynamodb", region_name="us-east-1")
@@ -2,49 +2,127 @@
 Integration tests for the portfolio API.
 """
 
-import json
-import os
+from decimal import Decimal
+
+import orjson
 import pytest
-import boto3
-from moto import mock_dynamodb
+
+from src.lib.db import dynamo_client
 
 # Import Lambda functions
+from src.functions.portfolios import create, delete, get, list as list_, update
 from src.functions.portfolios.list import lambda_handler as list_handler
 from src.functions.portfolios.get import lambda_handler as get_handler
 from src.functions.portfolios.create import lambda_handler as create_handler
 from src.functions.portfolios.update import lambda_handler as update_handler
 from src.functions.portfolios.delete import lambda_handler as delete_handler
 
+TABLE_NAME = "test-portfolios"
 
-@pytest.fixture
-def dynamodb_table():
-    """Create a mock DynamoDB table for testing."""
-    with mock_dynamodb():
-        # Create DynamoDB client
-        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-        
+# Request bodies, serialized once for the whole module
+CREATE_BODY = orjson.dumps({
+    "name": "Test Portfolio",
+    "description": "Test Description",
+    "assets": {"AAPL": 0.5, "MSFT": 0.5},
+}).decode()
+UPDATE_BODY = orjson.dumps({
+    "name": "Updated Portfolio",
+    "assets": {"AAPL": 0.3, "MSFT": 0.3, "GOOGL": 0.4},
+}).decode()
+
+
+@pytest.fixture(scope="session")
+def dynamodb_table(dynamodb_resource):
+    """Create a mock DynamoDB table once and point the handlers at it."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
         # Create table
-        table_name = "test-portfolios"
-        table = dynamodb.create_table(
-            TableName=table_name,
+        table = dynamodb_resource.create_table(
+            TableName=TABLE_NAME,
             KeySchema=[
                 {"AttributeName": "id", "KeyType": "HASH"},
             ],
             AttributeDefinitions=[
                 {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": "entity_type", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "ByEntityType",
+                    "KeySchema": [
+                        {"AttributeName": "entity_type", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                    "ProvisionedThroughput": {
+                        "ReadCapacityUnits": 5,
+                        "WriteCapacityUnits": 5,
+                    },
+                },
             ],
             ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
         )
-        
-        # Set environment variable
-        os.environ["PORTFOLIO_TABLE"] = table_name
-        
+
+        # Handlers bind their table client at import, so rebind them to the mock
+        monkeypatch.setattr(dynamo_client, "_DYNAMODB", dynamodb_resource)
+        monkeypatch.setattr(dynamo_client, "_CLIENTS", {})
+        portfolio_table = dynamo_client.get_client(TABLE_NAME)
+        for module in (create, delete, get, list_, update):
+            monkeypatch.setattr(module, "portfolio_table", portfolio_table)
+
         yield table
-        
-        # Clean up
-        table.delete()
-        if "PORTFOLIO_TABLE" in os.environ:
-            del os.environ["PORTFOLIO_TABLE"]
+
+
+@pytest.fixture(autouse=True)
+def clean_table(dynamodb_table):
+    """Delete every item after each test so tests stay independent."""
+    yield
+
+    scan_kwargs = {"ProjectionExpression": "id"}
+    with dynamodb_table.batch_writer() as batch:
+        while True:
+            page = dynamodb_table.scan(**scan_kwargs)
+            for item in page["Items"]:
+                batch.delete_item(Key={"id": item["id"]})
+            if "LastEvaluatedKey" not in page:
+                break
+            scan_kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+@pytest.fixture
+def seeded_portfolio(dynamodb_table):
+    """Write a portfolio straight to the table and return its ID."""
+    item = {
+        "id": "fixed-uuid",
+        "name": "Test Portfolio",
+        "description": "Test Description",
+        "assets": {"AAPL": Decimal("0.5"), "MSFT": Decimal("0.5")},
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "entity_type": "portfolio",
+    }
+    dynamodb_table.put_item(Item=item)
+
+    return item["id"]
+
+
+@pytest.fixture
+def many_portfolios(dynamodb_table):
+    """Batch-write enough portfolios to span several list pages and return their IDs."""
+    ids = [f"portfolio-{i:03d}" for i in range(30)]
+    with dynamodb_table.batch_writer() as batch:
+        for i, portfolio_id in enumerate(ids):
+            batch.put_item(Item={
+                "id": portfolio_id,
+                "name": f"Portfolio {i}",
+                "description": "",
+                "assets": {"AAPL": Decimal("1.0")},
+                "created_at": f"2025-01-01T00:00:{i:02d}+00:00",
+                "updated_at": f"2025-01-01T00:00:{i:02d}+00:00",
+                "entity_type": "portfolio",
+            })
+
+    return ids
 
 
 class TestPortfolioAPI:
@@ -53,46 +131,36 @@ class TestPortfolioAPI:
     def test_create_portfolio(self, dynamodb_table):
         """Test creating a portfolio."""
         # Create event
-        event = {
-            "body": json.dumps({
-                "name": "Test Portfolio",
-                "description": "Test Description",
-                "assets": {"AAPL": 0.5, "MSFT": 0.5},
-            })
-        }
+        event = {"body": CREATE_BODY}
         
         # Call Lambda function
         response = create_handler(event, {})
         
         # Check response
         assert response["statusCode"] == 201
-        body = json.loads(response["body"])
+        body = orjson.loads(response["body"])
         assert body["name"] == "Test Portfolio"
         assert body["description"] == "Test Description"
         assert body["assets"] == {"AAPL": 0.5, "MSFT": 0.5}
         assert "id" in body
         assert "created_at" in body
         assert "updated_at" in body
+        assert "entity_type" not in body
         
-        # Save portfolio ID for later tests
         portfolio_id = body["id"]
         
-        # Check DynamoDB
+        # Check DynamoDB (the stored item keeps its index key)
         item = dynamodb_table.get_item(Key={"id": portfolio_id})
         assert "Item" in item
         assert item["Item"]["name"] == "Test Portfolio"
-        
-        return portfolio_id
+        assert item["Item"]["entity_type"] == "portfolio"
 
-    def test_get_portfolio(self, dynamodb_table):
+    def test_get_portfolio(self, seeded_portfolio):
         """Test getting a portfolio."""
-        # Create a portfolio first
-        portfolio_id = self.test_create_portfolio(dynamodb_table)
-        
         # Create event
         event = {
             "pathParameters": {
-                "id": portfolio_id
+                "id": seeded_portfolio
             }
         }
         
@@ -101,17 +169,15 @@ class TestPortfolioAPI:
         
         # Check response
         assert response["statusCode"] == 200
-        body = json.loads(response["body"])
-        assert body["id"] == portfolio_id
+        body = orjson.loads(response["body"])
+        assert body["id"] == seeded_portfolio
         assert body["name"] == "Test Portfolio"
         assert body["description"] == "Test Description"
         assert body["assets"] == {"AAPL": 0.5, "MSFT": 0.5}
+        assert "entity_type" not in body
 
-    def test_list_portfolios(self, dynamodb_table):
+    def test_list_portfolios(self, seeded_portfolio):
         """Test listing portfolios."""
-        # Create a portfolio first
-        portfolio_id = self.test_create_portfolio(dynamodb_table)
-        
         # Create event
         event = {}
         
@@ -120,29 +186,47 @@ class TestPortfolioAPI:
         
         # Check response
         assert response["statusCode"] == 200
-        body = json.loads(response["body"])
+        body = orjson.loads(response["body"])
         assert isinstance(body, list)
         assert len(body) >= 1
         
         # Find our portfolio
-        portfolio = next((p for p in body if p["id"] == portfolio_id), None)
+        portfolio = next((p for p in body if p["id"] == seeded_portfolio), None)
         assert portfolio is not None
         assert portfolio["name"] == "Test Portfolio"
+        assert "entity_type" not in portfolio
+
+    def test_list_portfolios_paginated(self, many_portfolios):
+        """Test following nextToken through every page of portfolios."""
+        listed = []
+        query_params = {"limit": "7"}
+        while True:
+            # Call Lambda function for the next page
+            response = list_handler({"queryStringParameters": query_params}, {})
+
+            # Check response
+            assert response["statusCode"] == 200
+            page = orjson.loads(response["body"])
+            assert len(page) <= 7
+            listed.extend(p["id"] for p in page)
+
+            next_token = response["headers"].get("X-Next-Token")
+            if not next_token:
+                break
+            query_params = {"limit": "7", "nextToken": next_token}
+
+        # Every portfolio is listed exactly once (moto does not order limited pages)
+        assert len(listed) == len(many_portfolios)
+        assert set(listed) == set(many_portfolios)
 
-    def test_update_portfolio(self, dynamodb_table):
+    def test_update_portfolio(self, dynamodb_table, seeded_portfolio):
         """Test updating a portfolio."""
-        # Create a portfolio first
-        portfolio_id = self.test_create_portfolio(dynamodb_table)
-        
         # Create event
         event = {
             "pathParameters": {
-                "id": portfolio_id
+                "id": seeded_portfolio
             },
-            "body": json.dumps({
-                "name": "Updated Portfolio",
-                "assets": {"AAPL": 0.3, "MSFT": 0.3, "GOOGL": 0.4},
-            })
+            "body": UPDATE_BODY,
         }
         
         # Call Lambda function
@@ -150,26 +234,24 @@ class TestPortfolioAPI:
         
         # Check response
         assert response["statusCode"] == 200
-        body = json.loads(response["body"])
-        assert body["id"] == portfolio_id
+        body = orjson.loads(response["body"])
+        assert body["id"] == seeded_portfolio
         assert body["name"] == "Updated Portfolio"
         assert body["description"] == "Test Description"  # Unchanged
         assert body["assets"] == {"AAPL": 0.3, "MSFT": 0.3, "GOOGL": 0.4}
+        assert "entity_type" not in body
         
         # Check DynamoDB
-        item = dynamodb_table.get_item(Key={"id": portfolio_id})
+        item = dynamodb_table.get_item(Key={"id": seeded_portfolio})
         assert "Item" in item
         assert item["Item"]["name"] == "Updated Portfolio"
 
-    def test_delete_portfolio(self, dynamodb_table):
+    def test_delete_portfolio(self, dynamodb_table, seeded_portfolio):
         """Test deleting a portfolio."""
-        # Create a portfolio first
-        portfolio_id = self.test_create_portfolio(dynamodb_table)
-        
         # Create event
         event = {
             "pathParameters": {
-                "id": portfolio_id
+                "id": seeded_portfolio
             }
         }
         
@@ -180,7 +262,7 @@ class TestPortfolioAPI:
         assert response["statusCode"] == 204
         
         # Check DynamoDB
-        item = dynamodb_table.get_item(Key={"id": portfolio_id})
+        item = dynamodb_table.get_item(Key={"id": seeded_portfolio})
         assert "Item" not in item
 
     def test_get_nonexistent_portfolio(self, dynamodb_table):
@@ -197,6 +279,45 @@ class TestPortfolioAPI:
         
         # Check response
         assert response["statusCode"] == 404
-        body = json.loads(response["body"])
+        body = orjson.loads(response["body"])
         assert "error" in body
         assert body["error"]["code"] == "NOT_FOUND"
+
+    def test_delete_nonexistent_portfolio(self, dynamodb_table):
+        """Test deleting a nonexistent portfolio."""
+        # Create event
+        event = {
+            "pathParameters": {
+                "id": "nonexistent-id"
+            }
+        }
+
+        # Call Lambda function
+        response = delete_handler(event, {})
+
+        # Check response
+        assert response["statusCode"] == 404
+        body = orjson.loads(response["body"])
+        assert body["error"]["code"] == "NOT_FOUND"
+
+    def test_update_nonexistent_portfolio(self, dynamodb_table):
+        """Test that updating a nonexistent portfolio is a 404 and creates nothing."""
+        # Create event
+        event = {
+            "pathParameters": {
+                "id": "nonexistent-id"
+            },
+            "body": UPDATE_BODY,
+        }
+
+        # Call Lambda function
+        response = update_handler(event, {})
+
+        # Check response
+        assert response["statusCode"] == 404
+        body = orjson.loads(response["body"])
+        assert body["error"]["code"] == "NOT_FOUND"
+
+        # Check DynamoDB (the conditional update must not upsert)
+        item = dynamodb_table.get_item(Key={"id": "nonexistent-id"})
+        assert "Item" not in item
@@ -0,0 +1,29 @@
+"""
+Unit tests for the get prices function.
+"""
+
+import orjson
+
+from src.functions.market_data.get_prices import lambda_handler
+
+
+class TestLambdaHandler:
+    """Tests for lambda_handler parameter validation."""
+
+    def test_rejects_offset_aware_date(self):
+        """Test that a datetime with a UTC offset is a 400, not a comparison error."""
+        event = {
+            "queryStringParameters": {
+                "symbols": "AAPL",
+                "startDate": "2024-01-01T00:00:00+00:00",
+                "endDate": "2024-02-01",
+            }
+        }
+
+        response = lambda_handler(event, {})
+
+        assert response["statusCode"] == 400
+        body = orjson.loads(response["body"])
+        assert body["error"]["details"] == [
+            "Invalid start date format (should be YYYY-MM-DD)"
+        ]
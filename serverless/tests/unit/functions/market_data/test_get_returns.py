@@ -0,0 +1,66 @@
+"""
+Unit tests for the get returns function.
+"""
+
+import orjson
+import pytest
+
+from src.functions.market_data.get_returns import calculate_returns, lambda_handler
+
+
+class TestCalculateReturns:
+    """Tests for calculate_returns."""
+
+    DATES = [
+        "2024-01-26",  # Friday
+        "2024-01-29",  # Monday
+        "2024-01-31",
+        "2024-02-02",
+        "2024-02-05",  # Monday
+    ]
+    CLOSES = [100.0, 110.0, 121.0, 99.0, 108.9]
+
+    def test_daily_returns(self):
+        """Test returns between consecutive closes."""
+        returns = calculate_returns(self.DATES, self.CLOSES, "daily")
+
+        assert returns == pytest.approx([0.1, 0.1, 99.0 / 121.0 - 1.0, 0.1])
+
+    def test_weekly_returns(self):
+        """Test returns between the last closes of each week."""
+        returns = calculate_returns(self.DATES, self.CLOSES, "weekly")
+
+        assert returns == pytest.approx([99.0 / 100.0 - 1.0, 0.1])
+
+    def test_monthly_returns(self):
+        """Test returns between the last closes of each month."""
+        returns = calculate_returns(self.DATES, self.CLOSES, "monthly")
+
+        assert returns == pytest.approx([108.9 / 121.0 - 1.0])
+
+    @pytest.mark.parametrize("return_type", ["daily", "weekly", "monthly"])
+    def test_empty_prices(self, return_type):
+        """Test that no prices give no returns."""
+        assert calculate_returns([], [], return_type) == []
+
+
+class TestLambdaHandler:
+    """Tests for lambda_handler parameter validation."""
+
+    def test_rejects_offset_aware_date(self):
+        """Test that a datetime with a UTC offset is a 400, not a comparison error."""
+        event = {
+            "queryStringParameters": {
+                "symbols": "AAPL",
+                "startDate": "2024-01-01T00:00:00+00:00",
+                "endDate": "2024-02-01",
+            }
+        }
+
+        response = lambda_handler(event, {})
+
+        assert response["statusCode"] == 400
+        body = orjson.loads(response["body"])
+        assert body["error"]["details"] == [
+            "Invalid start date format (should be YYYY-MM-DD)"
+        ]
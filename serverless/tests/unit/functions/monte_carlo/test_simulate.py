@@ -0,0 +1,273 @@
+"""
+Unit tests for the Monte Carlo simulation function.
+"""
+
+import gzip
+import io
+from decimal import Decimal
+
+import boto3
+import numpy as np
+import orjson
+import pytest
+from moto import mock_s3
+
+from src.functions.monte_carlo import simulate
+from src.functions.monte_carlo.simulate import (
+    covariance_factor,
+    lambda_handler,
+    run_monte_carlo_simulation,
+)
+from src.lib.db import dynamo_client, s3_client
+
+BUCKET_NAME = "test-data"
+
+# Simulation request for the seeded two-asset portfolio
+REQUEST_BODY = {
+    "portfolioId": "portfolio-1",
+    "numSimulations": 40,
+    "numPeriods": 12,
+    "seed": 7,
+    "returns": {
+        "AAPL": [0.01, -0.02, 0.015, 0.005],
+        "MSFT": [0.02, -0.01, 0.0, 0.01],
+    },
+}
+
+
+@pytest.fixture
+def simulation_tables(dynamodb_resource, monkeypatch):
+    """Create mocked portfolio and result tables and seed one portfolio."""
+    tables = [
+        dynamodb_resource.create_table(
+            TableName=name,
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        for name in ("simulation-portfolios", "simulation-results")
+    ]
+    tables[0].put_item(Item={
+        "id": "portfolio-1",
+        "name": "Test Portfolio",
+        "assets": {"AAPL": Decimal("0.5"), "MSFT": Decimal("0.5")},
+    })
+
+    # The handler binds its table clients at import, so rebind them to the mock
+    monkeypatch.setattr(dynamo_client, "_DYNAMODB", dynamodb_resource)
+    monkeypatch.setattr(dynamo_client, "_CLIENTS", {})
+    for attribute, table in zip(("portfolio_table", "simulation_result_table"), tables):
+        monkeypatch.setattr(simulate, attribute, dynamo_client.get_client(table.name))
+
+    yield tables[1]
+
+    for table in tables:
+        table.delete()
+
+
+@pytest.fixture
+def data_bucket(monkeypatch):
+    """Create a mocked data bucket and point the S3 client and handler at it."""
+    with mock_s3():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET_NAME)
+        monkeypatch.setattr(s3_client, "s3", s3)
+        monkeypatch.setattr(simulate, "DATA_BUCKET", BUCKET_NAME)
+        yield s3
+
+
+class TestRunMonteCarloSimulation:
+    """Test the run_monte_carlo_simulation function."""
+
+    def test_simulation_shape(self):
+        """Test the shape and starting value of the simulation results."""
+        # Run a simulation
+        results = run_monte_carlo_simulation(
+            weights=np.array([0.5, 0.5]),
+            mean_returns=np.array([0.001, 0.002]),
+            cov_matrix=np.array([[0.0004, 0.0001], [0.0001, 0.0009]]),
+            initial_investment=10000,
+            num_periods=20,
+            num_simulations=50,
+        )
+
+        # Check results
+        assert results.shape == (50, 21)
+        assert results.dtype == np.float32
+        assert np.all(results[:, 0] == 10000)
+        assert np.all(results > 0)
+
+    def test_simulation_without_volatility(self):
+        """Test that a zero-volatility portfolio compounds deterministically."""
+        # Run a simulation
+        results = run_monte_carlo_simulation(
+            weights=np.array([0.5, 0.5]),
+            mean_returns=np.array([0.01, 0.03]),
+            cov_matrix=np.zeros((2, 2)),
+            initial_investment=100,
+            num_periods=10,
+            num_simulations=3,
+        )
+
+        # Check results (rebalanced every period, so the portfolio grows 2% a period)
+        periods = np.arange(11)
+        expected = 100 * 1.02 ** periods
+        for path in results:
+            assert path == pytest.approx(expected)
+
+    def test_simulation_with_inexact_weights(self):
+        """Test that weights within the sum tolerance do not shrink every period."""
+        # Run a simulation with weights summing to 0.9999
+        results = run_monte_carlo_simulation(
+            weights=np.array([0.49995, 0.49995]),
+            mean_returns=np.array([0.01, 0.03]),
+            cov_matrix=np.zeros((2, 2)),
+            initial_investment=100,
+            num_periods=252,
+            num_simulations=3,
+        )
+
+        # Check results (growth is 1 + w . r, not sum(w) + w . r)
+        expected = 100 * (1 + 0.9999 * 0.02) ** np.arange(253)
+        for path in results:
+            assert path == pytest.approx(expected, rel=1e-4)
+
+    def test_simulation_with_seed(self):
+        """Test that generators with the same seed give the same paths."""
+        params = dict(
+            weights=np.array([0.5, 0.5]),
+            mean_returns=np.array([0.001, 0.002]),
+            cov_matrix=np.array([[0.0004, 0.0001], [0.0001, 0.0009]]),
+            initial_investment=10000,
+            num_periods=20,
+            num_simulations=50,
+        )
+
+        # Run simulations
+        first = run_monte_carlo_simulation(**params, rng=np.random.default_rng(7))
+        second = run_monte_carlo_simulation(**params, rng=np.random.default_rng(7))
+        other = run_monte_carlo_simulation(**params, rng=np.random.default_rng(8))
+
+        # Check results
+        assert np.array_equal(first, second)
+        assert not np.array_equal(first, other)
+
+    def test_simulation_without_paths(self, monkeypatch):
+        """Test that final values match the last column of the full paths."""
+        monkeypatch.setattr(simulate, "MAX_BLOCK_ELEMENTS", 400)
+        params = dict(
+            weights=np.array([0.5, 0.5]),
+            mean_returns=np.array([0.001, 0.002]),
+            cov_matrix=np.array([[0.0004, 0.0001], [0.0001, 0.0009]]),
+            initial_investment=10000,
+            num_periods=20,
+            num_simulations=50,
+        )
+
+        # Run simulations
+        paths = run_monte_carlo_simulation(**params, rng=np.random.default_rng(7))
+        final_values = run_monte_carlo_simulation(
+            **params, rng=np.random.default_rng(7), keep_paths=False
+        )
+
+        # Check results
+        assert final_values.shape == (50,)
+        assert final_values == pytest.approx(paths[:, -1], rel=1e-6)
+
+    def test_simulation_in_blocks(self, monkeypatch):
+        """Test that block-wise simulation fills every simulation."""
+        # Force several blocks, the last one partial
+        monkeypatch.setattr(simulate, "MAX_BLOCK_ELEMENTS", 40)
+
+        # Run a simulation
+        results = run_monte_carlo_simulation(
+            weights=np.array([1.0]),
+            mean_returns=np.array([0.01]),
+            cov_matrix=np.zeros((1, 1)),
+            initial_investment=100,
+            num_periods=10,
+            num_simulations=9,
+        )
+
+        # Check results
+        assert results.shape == (9, 11)
+        assert results[:, -1] == pytest.approx([100 * 1.01 ** 10] * 9)
+
+
+class TestCovarianceFactor:
+    """Test the covariance_factor function."""
+
+    @pytest.mark.parametrize(
+        "cov_matrix",
+        [
+            np.array([[0.04, 0.01], [0.01, 0.09]]),
+            np.array([[0.04, 0.0], [0.0, 0.0]]),
+            np.array([[0.04, 0.04], [0.04, 0.04]]),
+        ],
+    )
+    def test_factor_reconstructs_covariance(self, cov_matrix):
+        """Test that the factor reproduces the covariance matrix."""
+        factor = covariance_factor(cov_matrix)
+        assert factor @ factor.T == pytest.approx(cov_matrix)
+
+
+class TestLambdaHandler:
+    """Tests for lambda_handler with mocked DynamoDB and S3."""
+
+    def test_simulation_with_trajectories(self, simulation_tables, data_bucket):
+        """Test that trajectories are saved to S3 and linked from the response."""
+        # Call Lambda function
+        body = {**REQUEST_BODY, "includeTrajectories": True}
+        response = lambda_handler({"body": orjson.dumps(body).decode()}, {})
+
+        # Check response
+        assert response["statusCode"] == 200
+        result = orjson.loads(response["body"])
+        key = result["result"]["trajectoryS3Key"]
+        assert key == f"simulations/{result['id']}.npy.gz"
+        assert key in result["trajectoryUrl"]
+        assert set(result["result"]["trajectoryBands"]) == {"5", "25", "50", "75", "95"}
+
+        # Check the saved trajectories
+        saved = data_bucket.get_object(Bucket=BUCKET_NAME, Key=key)["Body"].read()
+        paths = np.load(io.BytesIO(gzip.decompress(saved)))
+        assert paths.shape == (40, 13)
+        assert np.all(paths[:, 0] == 10000)
+
+        # Check the stored result
+        item = simulation_tables.get_item(Key={"id": result["id"]})["Item"]
+        assert item["result"]["trajectoryS3Key"] == key
+
+    def test_simulation_without_trajectories(self, simulation_tables, data_bucket):
+        """Test that nothing is saved or linked when trajectories are not requested."""
+        # Call Lambda function
+        body = {**REQUEST_BODY, "includeTrajectories": False}
+        response = lambda_handler({"body": orjson.dumps(body).decode()}, {})
+
+        # Check response
+        assert response["statusCode"] == 200
+        result = orjson.loads(response["body"])
+        assert "trajectoryUrl" not in result
+        assert result["result"]["trajectoryS3Key"] is None
+        assert result["result"]["trajectoryBands"] is None
+
+        # Check nothing was written to S3
+        assert "Contents" not in data_bucket.list_objects_v2(Bucket=BUCKET_NAME)
+
+    def test_longest_simulation_fits_in_one_item(self, simulation_tables, data_bucket):
+        """Test that bands for the maximum number of periods fit in the result item."""
+        # Call Lambda function
+        body = {**REQUEST_BODY, "numPeriods": simulate.MAX_PERIODS}
+        response = lambda_handler({"body": orjson.dumps(body).decode()}, {})
+
+        # Check response
+        assert response["statusCode"] == 200
+
+    def test_too_many_periods(self, simulation_tables):
+        """Test that more periods than the stored bands can hold is a 400."""
+        # Call Lambda function
+        body = {**REQUEST_BODY, "numPeriods": simulate.MAX_PERIODS + 1}
+        response = lambda_handler({"body": orjson.dumps(body).decode()}, {})
+
+        # Check response
+        assert response["statusCode"] == 400
@@ -0,0 +1,52 @@
+"""
+Unit tests for the risk parity optimization function.
+"""
+
+import numpy as np
+import pytest
+
+from src.functions.optimization.risk_parity import solve_risk_parity
+
+COV_MATRIX = np.array(
+    [
+        [0.040, 0.006, 0.010],
+        [0.006, 0.090, 0.012],
+        [0.010, 0.012, 0.025],
+    ]
+)
+
+
+class TestSolveRiskParity:
+    """Test the solve_risk_parity function."""
+
+    def test_equal_risk_contributions(self):
+        """Test that the solution has equal risk contributions."""
+        # Solve
+        weights, converged = solve_risk_parity(COV_MATRIX)
+
+        # Check weights
+        assert converged
+        assert np.sum(weights) == pytest.approx(1.0)
+        assert np.all(weights > 0)
+
+        # Check risk contributions
+        risk_contribution = weights * (COV_MATRIX @ weights)
+        assert risk_contribution == pytest.approx(
+            np.full(3, risk_contribution.mean()), rel=1e-6
+        )
+
+    def test_uncorrelated_assets(self):
+        """Test that uncorrelated assets get inverse-volatility weights."""
+        # Solve
+        volatilities = np.array([0.1, 0.2, 0.4])
+        weights, converged = solve_risk_parity(np.diag(volatilities**2))
+
+        # Check weights
+        expected = (1.0 / volatilities) / np.sum(1.0 / volatilities)
+        assert converged
+        assert weights == pytest.approx(expected)
+
+    def test_not_converged(self):
+        """Test that the solver reports when it runs out of iterations."""
+        _, converged = solve_risk_parity(COV_MATRIX, max_iterations=1, tolerance=1e-12)
+        assert not converged
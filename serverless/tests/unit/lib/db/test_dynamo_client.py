@@ -0,0 +1,147 @@
+"""
+Unit tests for the DynamoDB client.
+"""
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from src.lib.db import dynamo_client
+
+
+@pytest.fixture
+def items_table(dynamodb_resource, monkeypatch):
+    """Create a mocked table and point the client cache at it."""
+    table = dynamodb_resource.create_table(
+        TableName="items",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    monkeypatch.setattr(dynamo_client, "_DYNAMODB", dynamodb_resource)
+    monkeypatch.setattr(dynamo_client, "_CLIENTS", {})
+
+    yield "items"
+
+    table.delete()
+
+
+@pytest.fixture
+def stubbed_dynamodb(monkeypatch):
+    """Point the client cache at a resource whose calls return canned responses."""
+    dynamodb = boto3.resource(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+    monkeypatch.setattr(dynamo_client, "_DYNAMODB", dynamodb)
+    monkeypatch.setattr(dynamo_client, "_CLIENTS", {})
+
+    with Stubber(dynamodb.meta.client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+class TestPutItems:
+    """Tests for put_items."""
+
+    def test_put_items_in_batches(self, items_table):
+        """Test that more items than fit in one batch are all written."""
+        dynamo_client.put_items(items_table, [{"id": str(i)} for i in range(60)])
+
+        assert len(dynamo_client.scan_items(items_table)) == 60
+
+
+class TestBatchGetItems:
+    """Tests for batch_get_items."""
+
+    def test_batch_get_items_in_batches(self, items_table):
+        """Test that keys beyond one batch are read and missing items skipped."""
+        dynamo_client.put_items(items_table, [{"id": str(i)} for i in range(150)])
+
+        keys = [{"id": str(i)} for i in range(40, 160)]
+        items = dynamo_client.batch_get_items(items_table, keys)
+
+        assert sorted(int(item["id"]) for item in items) == list(range(40, 150))
+
+    def test_unprocessed_keys_are_retried(self, stubbed_dynamodb):
+        """Test that keys DynamoDB did not process are requested again."""
+        stubbed_dynamodb.add_response(
+            "batch_get_item",
+            {
+                "Responses": {"items": [{"id": {"S": "1"}}]},
+                "UnprocessedKeys": {"items": {"Keys": [{"id": {"S": "2"}}]}},
+            },
+            {"RequestItems": {"items": {"Keys": [{"id": "1"}, {"id": "2"}]}}},
+        )
+        stubbed_dynamodb.add_response(
+            "batch_get_item",
+            {"Responses": {"items": [{"id": {"S": "2"}, "weight": {"N": "0.5"}}]}},
+            {"RequestItems": {"items": {"Keys": [{"id": "2"}]}}},
+        )
+
+        items = dynamo_client.batch_get_items("items", [{"id": "1"}, {"id": "2"}])
+
+        assert items == [{"id": "1"}, {"id": "2", "weight": 0.5}]
+
+    def test_unprocessed_keys_give_up(self, stubbed_dynamodb):
+        """Test that keys still unprocessed after every attempt raise an error."""
+        for _ in range(dynamo_client.BATCH_GET_ATTEMPTS):
+            stubbed_dynamodb.add_response(
+                "batch_get_item",
+                {
+                    "Responses": {"items": []},
+                    "UnprocessedKeys": {"items": {"Keys": [{"id": {"S": "1"}}]}},
+                },
+            )
+
+        with pytest.raises(RuntimeError, match="Unprocessed keys"):
+            dynamo_client.batch_get_items("items", [{"id": "1"}])
+
+
+class TestGetClient:
+    """Tests for get_client."""
+
+    def test_client_is_cached_per_table(self, items_table):
+        """Test that each table gets one client that is reused."""
+        client = dynamo_client.get_client(items_table)
+
+        assert dynamo_client.get_client(items_table) is client
+        assert dynamo_client.get_client("other") is not client
+        assert client.table.name == items_table
+
+
+class TestConditionsAndProjections:
+    """Tests for conditional deletes and projected reads."""
+
+    def test_get_item_attributes(self, items_table):
+        """Test that only the requested attributes are fetched."""
+        dynamo_client.put_item(items_table, {"id": "1", "name": "a", "assets": {}})
+
+        item = dynamo_client.get_item(items_table, {"id": "1"}, attributes=["name"])
+
+        assert item == {"name": "a"}
+
+    def test_conditional_delete_of_missing_item(self, items_table):
+        """Test that a failed delete condition is recognized."""
+        with pytest.raises(ClientError) as excinfo:
+            dynamo_client.delete_item(
+                items_table, {"id": "missing"}, condition_expression=Attr("id").exists()
+            )
+
+        assert dynamo_client.is_condition_failed(excinfo.value)
+
+
+class TestNumberConversion:
+    """Tests for float and Decimal conversion."""
+
+    def test_floats_round_trip(self, items_table):
+        """Test that nested floats are stored and read back as numbers."""
+        item = {"id": "1", "assets": {"AAPL": 0.6, "MSFT": 0.4}, "values": [1.5, 2]}
+
+        dynamo_client.put_item(items_table, item)
+
+        assert dynamo_client.get_item(items_table, {"id": "1"}) == item
@@ -2,9 +2,70 @@
 Unit tests for the portfolio model.
 """
 
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
 import pytest
-from datetime import datetime
-from src.lib.models.portfolio import Portfolio, create_portfolio, to_dict, from_dict
+
+from src.lib.models import portfolio as portfolio_module
+from src.lib.models.portfolio import (
+    Portfolio,
+    check_assets,
+    create_portfolio,
+    from_dict,
+    to_dict,
+    to_item,
+    to_response,
+)
+
+FIXED_UUID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+FIXED_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FrozenDateTime(datetime):
+    """datetime whose now() always returns FIXED_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW
+
+
+@pytest.fixture(autouse=True)
+def frozen(monkeypatch):
+    """Freeze the clock and ID generation used by the portfolio model."""
+    monkeypatch.setattr(portfolio_module, "datetime", FrozenDateTime)
+    monkeypatch.setattr(
+        portfolio_module, "uuid", SimpleNamespace(uuid4=lambda: FIXED_UUID)
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_portfolio():
+    """Portfolio with fixed values, shared across this module (do not mutate)."""
+    return Portfolio(
+        id="test-id",
+        name="Test Portfolio",
+        description="Test Description",
+        assets={"AAPL": 0.5, "MSFT": 0.5},
+        created_at="2025-01-01T00:00:00",
+        updated_at="2025-01-02T00:00:00",
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_dict():
+    """Stored form of the sample portfolio plus an unknown key (do not mutate)."""
+    return {
+        "id": "test-id",
+        "name": "Test Portfolio",
+        "description": "Test Description",
+        "assets": {"AAPL": 0.5, "MSFT": 0.5},
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-02T00:00:00",
+        "entity_type": "portfolio",
+        "unknown": "ignored",
+    }
 
 
 class TestPortfolio:
@@ -23,13 +84,12 @@ class TestPortfolio:
         assert portfolio.name == "Test Portfolio"
         assert portfolio.description == "Test Description"
         assert portfolio.assets == {"AAPL": 0.5, "MSFT": 0.5}
-        assert portfolio.id is not None
-        assert portfolio.created_at is not None
-        assert portfolio.updated_at is not None
+        assert portfolio.id == FIXED_UUID.hex
+        assert portfolio.created_at == FIXED_NOW.isoformat()
+        assert portfolio.updated_at == FIXED_NOW.isoformat()
 
-    def test_portfolio_validation(self):
-        """Test portfolio validation."""
-        # Valid portfolio
+    def test_portfolio_valid(self):
+        """Test that a valid portfolio passes validation."""
         portfolio = Portfolio(
             name="Test Portfolio",
             description="Test Description",
@@ -37,21 +97,34 @@ class TestPortfolio:
         )
         assert portfolio is not None
 
-        # Invalid portfolio (assets don't sum to 1.0)
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            {"assets": {"AAPL": 0.5, "MSFT": 0.6}},
+            {"assets": {}},
+            {"name": 1, "assets": {"AAPL": 1.0}},
+        ],
+        ids=["weights-not-summing-to-one", "empty-assets", "non-string-name"],
+    )
+    def test_portfolio_invalid(self, fields):
+        """Test that invalid portfolios are rejected."""
         with pytest.raises(ValueError):
             Portfolio(
-                name="Test Portfolio",
-                description="Test Description",
-                assets={"AAPL": 0.5, "MSFT": 0.6},
+                **{"name": "Test Portfolio", "description": "Test Description", **fields}
             )
 
-        # Invalid portfolio (empty assets)
-        with pytest.raises(ValueError):
-            Portfolio(
-                name="Test Portfolio",
-                description="Test Description",
-                assets={},
-            )
+    def test_check_assets(self):
+        """Test asset validation outside the model."""
+        # Many small weights sum to exactly 1.0
+        check_assets({f"A{i}": 0.001 for i in range(1000)})
+
+        # Booleans are not weights
+        with pytest.raises(ValueError, match="Invalid weight"):
+            check_assets({"AAPL": True})
+
+        # Assets must be a dictionary
+        with pytest.raises(ValueError, match="dictionary"):
+            check_assets([("AAPL", 1.0)])
 
     def test_create_portfolio_function(self):
         """Test the create_portfolio function."""
@@ -66,9 +139,9 @@ class TestPortfolio:
         assert portfolio.name == "Test Portfolio"
         assert portfolio.description == "Test Description"
         assert portfolio.assets == {"AAPL": 0.5, "MSFT": 0.5}
-        assert portfolio.id is not None
-        assert portfolio.created_at is not None
-        assert portfolio.updated_at is not None
+        assert portfolio.id == FIXED_UUID.hex
+        assert portfolio.created_at == FIXED_NOW.isoformat()
+        assert portfolio.updated_at == FIXED_NOW.isoformat()
 
         # Create a portfolio with custom ID and timestamps
         custom_id = "test-id"
@@ -88,20 +161,10 @@ class TestPortfolio:
         assert portfolio.created_at == created_at
         assert portfolio.updated_at == updated_at
 
-    def test_to_dict_function(self):
+    def test_to_dict_function(self, sample_portfolio):
         """Test the to_dict function."""
-        # Create a portfolio
-        portfolio = Portfolio(
-            id="test-id",
-            name="Test Portfolio",
-            description="Test Description",
-            assets={"AAPL": 0.5, "MSFT": 0.5},
-            created_at="2025-01-01T00:00:00",
-            updated_at="2025-01-02T00:00:00",
-        )
-
         # Convert to dictionary
-        portfolio_dict = to_dict(portfolio)
+        portfolio_dict = to_dict(sample_portfolio)
 
         # Check dictionary
         assert portfolio_dict["id"] == "test-id"
@@ -111,20 +174,21 @@ class TestPortfolio:
         assert portfolio_dict["created_at"] == "2025-01-01T00:00:00"
         assert portfolio_dict["updated_at"] == "2025-01-02T00:00:00"
 
-    def test_from_dict_function(self):
-        """Test the from_dict function."""
-        # Create a dictionary
-        portfolio_dict = {
-            "id": "test-id",
-            "name": "Test Portfolio",
-            "description": "Test Description",
-            "assets": {"AAPL": 0.5, "MSFT": 0.5},
-            "created_at": "2025-01-01T00:00:00",
-            "updated_at": "2025-01-02T00:00:00",
-        }
+    def test_to_item_function(self, sample_portfolio):
+        """Test that only the stored item carries the index key."""
+        # Convert to stored item
+        item = to_item(sample_portfolio)
 
+        # Check item and its API representation
+        assert item["entity_type"] == "portfolio"
+        assert "entity_type" not in to_dict(sample_portfolio)
+        assert to_response(item) == to_dict(sample_portfolio)
+
+    def test_from_dict_function(self, sample_dict, sample_portfolio):
+        """Test the from_dict function."""
         # Convert to Portfolio object
-        portfolio = from_dict(portfolio_dict)
+        portfolio = from_dict(sample_dict)
+        assert portfolio == sample_portfolio
 
         # Check attributes
         assert portfolio.id == "test-id"
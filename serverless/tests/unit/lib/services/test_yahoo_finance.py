@@ -0,0 +1,205 @@
+"""
+Unit tests for the Yahoo Finance service.
+"""
+
+import os
+import time
+
+import pytest
+import requests
+import responses
+
+from src.lib.services import yahoo_finance
+from src.lib.services.yahoo_finance import CHART_URL, get_price_histories
+
+
+@pytest.fixture(autouse=True)
+def price_cache(tmp_path, monkeypatch):
+    """Use an empty price cache for each test."""
+    monkeypatch.setattr(yahoo_finance, "CACHE_DIR", str(tmp_path))
+    yahoo_finance._get_cached_price_history.cache_clear()
+    yield tmp_path
+    yahoo_finance._get_cached_price_history.cache_clear()
+
+
+def chart_response(closes, adjusted_closes):
+    """Build a chart API response for daily prices starting 2024-01-02."""
+    # 14:30 UTC is the US market open, gmtoffset shifts it to New York time
+    timestamps = [1704205800 + 86400 * i for i in range(len(closes))]
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {"gmtoffset": -18000},
+                    "timestamp": timestamps,
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": closes,
+                                "high": closes,
+                                "low": closes,
+                                "close": closes,
+                                "volume": [100] * len(closes),
+                            }
+                        ],
+                        "adjclose": [{"adjclose": adjusted_closes}],
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+class TestGetPriceHistories:
+    """Test the get_price_histories function."""
+
+    @responses.activate
+    def test_adjusted_prices(self):
+        """Test that prices are adjusted and rows without a usable close are dropped."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0, None, 0.0, 12.0], [5.0, None, 0.0, 6.0]),
+        )
+
+        # Get price history
+        result = get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d")
+
+        # Check prices
+        prices = result["AAPL"]
+        assert prices["dates"] == ["2024-01-02", "2024-01-05"]
+        assert prices["open"] == pytest.approx([5.0, 6.0])
+        assert prices["close"] == pytest.approx([5.0, 6.0])
+        assert prices["volume"] == [100, 100]
+
+    @responses.activate
+    def test_unknown_symbols_are_omitted(self):
+        """Test that symbols without data are left out of the result."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+        responses.get(
+            CHART_URL.format(symbol="NOPE"),
+            status=404,
+            json={"chart": {"result": None, "error": {"code": "Not Found"}}},
+        )
+
+        # Get price history (duplicates are only fetched once)
+        result = get_price_histories(
+            ["AAPL", "NOPE", "AAPL"], "2024-01-01", "2024-01-31", "1d"
+        )
+
+        # Check result
+        assert list(result) == ["AAPL"]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_failed_symbols_are_omitted(self):
+        """Test that one symbol's server error or timeout does not fail the others."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+        responses.get(CHART_URL.format(symbol="MSFT"), status=503)
+        responses.get(
+            CHART_URL.format(symbol="GOOG"),
+            body=requests.exceptions.ConnectTimeout(),
+        )
+
+        # Get price history
+        result = get_price_histories(
+            ["AAPL", "MSFT", "GOOG"], "2024-01-01", "2024-01-31", "1d"
+        )
+
+        # Check result
+        assert list(result) == ["AAPL"]
+
+    @responses.activate
+    def test_failures_are_not_cached(self, price_cache):
+        """Test that a failed download is retried on the next request."""
+        responses.get(CHART_URL.format(symbol="AAPL"), status=503)
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+
+        # Fail once, then succeed
+        assert get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d") == {}
+        result = get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d")
+
+        # Check result
+        assert list(result) == ["AAPL"]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_symbols_are_escaped(self):
+        """Test that a symbol cannot change the request path."""
+        responses.get(
+            "https://query1.finance.yahoo.com/v8/finance/chart/..%2FBRK%2FB%3Fx%23",
+            json=chart_response([10.0], [10.0]),
+        )
+
+        # Get price history
+        result = get_price_histories(["../BRK/B?x#"], "2024-01-01", "2024-01-31", "1d")
+
+        # Check the escaped URL was requested
+        assert list(result) == ["../BRK/B?x#"]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_historical_ranges_are_cached(self, price_cache):
+        """Test that historical ranges are served from memory and disk."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+
+        # Download once
+        first = get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d")
+        assert len(responses.calls) == 1
+        assert len(list(price_cache.iterdir())) == 1
+
+        # Served from memory
+        assert get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d") == first
+        assert len(responses.calls) == 1
+
+        # Served from disk in a new process
+        yahoo_finance._get_cached_price_history.cache_clear()
+        assert get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d") == first
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_expired_ranges_are_downloaded_again(self, price_cache):
+        """Test that cached ranges older than the TTL are refreshed."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+
+        # Download once, then age the cached file past the TTL
+        get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d")
+        expired = time.time() - yahoo_finance.CACHE_TTL - 1
+        for path in price_cache.iterdir():
+            os.utime(path, (expired, expired))
+
+        # Downloaded again in a new process
+        yahoo_finance._get_cached_price_history.cache_clear()
+        get_price_histories(["AAPL"], "2024-01-01", "2024-01-31", "1d")
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_open_ranges_are_not_cached(self, price_cache):
+        """Test that ranges ending in the future are always downloaded."""
+        responses.get(
+            CHART_URL.format(symbol="AAPL"),
+            json=chart_response([10.0], [10.0]),
+        )
+
+        # Download twice
+        get_price_histories(["AAPL"], "2024-01-01", "9999-12-31", "1d")
+        get_price_histories(["AAPL"], "2024-01-01", "9999-12-31", "1d")
+
+        # Check nothing was cached
+        assert len(responses.calls) == 2
+        assert not list(price_cache.iterdir())
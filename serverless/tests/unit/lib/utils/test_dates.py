@@ -0,0 +1,40 @@
+"""
+Unit tests for the date utility.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.lib.utils.dates import parse_date
+
+
+class TestParseDate:
+    """Tests for parse_date."""
+
+    def test_valid_date(self):
+        """Test that a YYYY-MM-DD date is parsed."""
+        assert parse_date("2024-02-29") == date(2024, 2, 29)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2024-01-01T00:00:00+00:00",
+            "20240101",
+            "2024-W01-1",
+            "2024-02-30",
+            "2024-01-01\n",
+            "",
+        ],
+        ids=[
+            "offset-aware",
+            "compact",
+            "week-date",
+            "out-of-range",
+            "trailing-newline",
+            "empty",
+        ],
+    )
+    def test_rejects_non_canonical_dates(self, value):
+        """Test that anything but a valid YYYY-MM-DD date is rejected."""
+        assert parse_date(value) is None
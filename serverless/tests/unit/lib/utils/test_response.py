@@ -0,0 +1,31 @@
+"""
+Unit tests for the response utility.
+"""
+
+from src.lib.utils import response
+
+
+class TestSuccess:
+    """Tests for success."""
+
+    def test_no_content_has_empty_body(self):
+        """Test that a 204 response has no body."""
+        result = response.success(None, status_code=204)
+
+        assert result["statusCode"] == 204
+        assert result["body"] == ""
+
+    def test_extra_headers_do_not_leak(self):
+        """Test that extra headers are merged without changing the defaults."""
+        result = response.success({"ok": True}, headers={"X-Next-Token": "abc"})
+
+        assert result["headers"]["X-Next-Token"] == "abc"
+        assert "X-Next-Token" not in response.success({})["headers"]
+        assert result["body"] == '{"ok":true}'
+
+    def test_mutated_headers_do_not_leak(self):
+        """Test that changing one response's headers leaves later responses alone."""
+        first = response.success({})
+        first["headers"]["X-Next-Token"] = "abc"
+
+        assert "X-Next-Token" not in response.success({})["headers"]